@@ -0,0 +1,96 @@
+import os
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+import numpy as np
+
+from engine import DEFAULT_SETTINGS, WarSimulation
+
+# Статистики, які збираються з кожного запуску
+STATISTICS_KEYS = ("population_size_a", "population_size_b", "average_efficiency_a", "average_efficiency_b")
+
+
+def run_single(settings, seed):
+    """
+    Один запуск war-симуляції без графіки з власними потоками випадкових чисел (engine.RandomStreams).
+
+    Returns:
+        dict: Масиви статистик за ітераціями (довжина = кількість виконаних ітерацій).
+    """
+    simulation = WarSimulation(settings, seed=seed)
+    simulation.run()
+    return {key: np.asarray(simulation.statistics[key], dtype=np.float64) for key in STATISTICS_KEYS}
+
+
+def run_batch(settings, seeds, max_workers=None, quantiles=(0.05, 0.5, 0.95)):
+    """
+    Запускає war-симуляцію для кожного seed у пулі процесів (за замовчуванням на всіх ядрах).
+
+    Parameters:
+        settings (dict): Параметри симуляції (ключі як у engine.DEFAULT_SETTINGS).
+        seeds (list[int]): Зерна; кожне дає окремий запуск, відтворюваний біт-у-біт
+            незалежно від кількості процесів.
+        max_workers (int | None): Кількість процесів (None — усі ядра).
+        quantiles (tuple[float]): Квантилі для довірчих смуг.
+
+    Returns:
+        dict: Для кожної статистики масив розміру (len(seeds), NUM_ITERATIONS),
+        де ітерації після зупинки запуску (вимирання чи вибух) заповнені NaN;
+        "mean" і "quantiles" — середні та квантилі по запусках для кожної ітерації;
+        "active" — кількість запусків, що ще тривали на кожній ітерації.
+    """
+    settings = {**DEFAULT_SETTINGS, **settings}
+    seeds = list(seeds)
+    num_iterations = settings["NUM_ITERATIONS"]
+    workers = max_workers or os.cpu_count() or 1
+    chunksize = max(1, len(seeds) // (4 * workers))
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(run_single, repeat(settings), seeds, chunksize=chunksize))
+
+    batch = {"iteration": np.arange(num_iterations), "seeds": np.array(seeds), "quantile_levels": np.array(quantiles)}
+    for key in STATISTICS_KEYS:
+        stacked = np.full((len(seeds), num_iterations), np.nan)
+        for row, result in zip(stacked, results):
+            row[:len(result[key])] = result[key]
+        batch[key] = stacked
+
+    batch["active"] = np.count_nonzero(~np.isnan(batch[STATISTICS_KEYS[0]]), axis=0)
+    batch["mean"] = {}
+    batch["quantiles"] = {}
+    with warnings.catch_warnings():
+        # Ітерації, до яких не дожив жоден запуск, залишаються NaN
+        warnings.simplefilter("ignore", RuntimeWarning)
+        for key in STATISTICS_KEYS:
+            batch["mean"][key] = np.nanmean(batch[key], axis=0)
+            batch["quantiles"][key] = np.nanquantile(batch[key], quantiles, axis=0)
+    return batch
+
+
+def plot_batch(batch):
+    import matplotlib.pyplot as plt
+
+    iterations = batch["iteration"]
+    plt.figure(figsize=(12, 6))
+    for position, (keys, ylabel, title) in enumerate([
+        (("population_size_a", "population_size_b"), "Population Size", "Population Size Over Time"),
+        (("average_efficiency_a", "average_efficiency_b"), "Average Efficiency", "Average Efficiency Over Time"),
+    ]):
+        plt.subplot(1, 2, position + 1)
+        for key, color in zip(keys, ("blue", "red")):
+            bands = batch["quantiles"][key]
+            plt.plot(iterations, batch["mean"][key], label=key, color=color)
+            plt.fill_between(iterations, bands[0], bands[-1], color=color, alpha=0.2)
+        plt.xlabel("Iteration")
+        plt.ylabel(ylabel)
+        plt.title(title)
+        plt.legend()
+    plt.tight_layout()
+    plt.show()
+
+
+if __name__ == "__main__":
+    batch = run_batch({}, range(100))
+    print(f"Запусків, що дійшли до кінця: {batch['active'][-1]} із {len(batch['seeds'])}")
+    plot_batch(batch)
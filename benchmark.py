@@ -0,0 +1,230 @@
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import platform
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from engine import MODELS, Simulation
+from instrumentation import Instrumentation
+from replicator import replicator_dynamics_batch, replicator_ode
+
+try:
+    import resource
+except ImportError:  # Windows: пік RSS не вимірюється
+    resource = None
+
+HISTORY_FILE = "benchmark_history.json"
+BASELINE_FILE = "benchmark_baseline.json"
+
+POPULATION_SCALES = (100, 1_000, 10_000, 100_000, 1_000_000)
+BATCH_SCALES = (1, 100, 10_000, 1_000_000)
+
+# Один запуск: не більше MAX_ITERATIONS ітерацій і не довше TIME_BUDGET секунд.
+# Короткі випадки повторюються (з наступними seed), доки сумарний час не досягне MIN_SECONDS
+MAX_ITERATIONS = 50
+TIME_BUDGET = 5.0
+MIN_SECONDS = 0.5
+REPLICATOR_STEPS = 50
+
+# "Камінь, ножиці, папір" для реплікаторних випадків
+RPS_PAYOFF = np.array([
+    [0, -1, 1],
+    [1, 0, -1],
+    [-1, 1, 0],
+])
+
+
+def scaled_settings(model, population):
+    """
+    Налаштування моделі з початковою популяцією population.
+
+    Кількість ресурсів масштабується пропорційно до налаштувань за
+    замовчуванням, а POPULATION_LIMIT обмежує ріст десятикратним розміром.
+    """
+    defaults = model.default_settings
+    count_keys = [species.count_key for species in model.species]
+    default_population = sum(defaults[key] for key in count_keys)
+    settings = {key: max(1, round(population * defaults[key] / default_population)) for key in count_keys}
+    resources_per_organism = defaults["RESOURCE_GENERATION"] ** 2 / default_population
+    settings["RESOURCE_GENERATION"] = max(1, round(math.sqrt(resources_per_organism * population)))
+    settings["POPULATION_LIMIT"] = 10 * population
+    return settings
+
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    # ru_maxrss у Linux — у кілобайтах, у macOS — у байтах
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if platform.system() == "Darwin" else peak / 2**10
+
+
+def summarize(iterations, seconds, **extra):
+    return {
+        "iterations": iterations,
+        "seconds": seconds,
+        "iterations_per_second": iterations / seconds if seconds > 0 else 0.0,
+        "peak_rss_mb": peak_rss_mb(),
+        **extra,
+    }
+
+
+def run_model_case(model_name, population, seed=0):
+    model = MODELS[model_name]
+    settings = scaled_settings(model, population)
+    iterations, seconds, runs = 0, 0.0, 0
+    phase_seconds = dict.fromkeys(Instrumentation.PHASES, 0.0)
+    while seconds < MIN_SECONDS:
+        simulation = Simulation(model, settings, seed=seed + runs, instrument=True)
+        start = time.perf_counter()
+        while simulation.iteration < MAX_ITERATIONS and time.perf_counter() - start < TIME_BUDGET:
+            if simulation.step() is not None:
+                break
+        seconds += time.perf_counter() - start
+        iterations += simulation.iteration
+        runs += 1
+        table = simulation.instrumentation.table()
+        for phase in phase_seconds:
+            phase_seconds[phase] += float(table[f"time_{phase}"].sum())
+    return summarize(iterations, seconds, runs=runs, phase_seconds=phase_seconds)
+
+
+def run_replicator_case(batch, seed=0):
+    rng = np.random.default_rng(seed)
+    initial = rng.dirichlet(np.ones(3), size=batch)
+    out = np.empty((REPLICATOR_STEPS + 1, batch, 3))
+    iterations, seconds = 0, 0.0
+    while seconds < MIN_SECONDS:
+        start = time.perf_counter()
+        # Зсув виплат на +2 робить їх додатними (дискретна динаміка потребує x . f > 0)
+        replicator_dynamics_batch(RPS_PAYOFF + 2, initial, REPLICATOR_STEPS, out=out)
+        seconds += time.perf_counter() - start
+        iterations += REPLICATOR_STEPS
+    return summarize(iterations, seconds)
+
+
+def run_replicator_ode_case(seed=0):
+    rng = np.random.default_rng(seed)
+    t_eval = np.linspace(0, 100, 1001)
+    iterations, seconds = 0, 0.0
+    while seconds < MIN_SECONDS:
+        start = time.perf_counter()
+        replicator_ode(RPS_PAYOFF, rng.dirichlet(np.ones(3)), 100, t_eval=t_eval)
+        seconds += time.perf_counter() - start
+        iterations += len(t_eval)
+    return summarize(iterations, seconds)
+
+
+def benchmark_cases(max_population=POPULATION_SCALES[-1], max_batch=BATCH_SCALES[-1]):
+    """Список випадків (назва, функція, аргументи)."""
+    cases = []
+    for model_name in MODELS:
+        for population in POPULATION_SCALES:
+            if population <= max_population:
+                cases.append((f"{model_name}/{population}", run_model_case, (model_name, population)))
+    for batch in BATCH_SCALES:
+        if batch <= max_batch:
+            cases.append((f"replicator_batch/{batch}", run_replicator_case, (batch,)))
+    cases.append(("replicator_ode/rps", run_replicator_ode_case, ()))
+    return cases
+
+
+def run_benchmarks(cases):
+    """
+    Виконує кожен випадок в окремому новому процесі, щоб peak RSS
+    стосувався лише цього випадку.
+
+    Returns:
+        dict: Назва випадку -> результати.
+    """
+    results = {}
+    context = multiprocessing.get_context("spawn")
+    for name, function, args in cases:
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+            results[name] = executor.submit(function, *args).result()
+        result = results[name]
+        rss = f"{result['peak_rss_mb']:.0f} МБ" if result["peak_rss_mb"] is not None else "невідомо"
+        print(f"{name}: {result['iterations_per_second']:.1f} ітер/с, пік RSS {rss}")
+    return results
+
+
+def find_regressions(results, baseline, tolerance=0.1):
+    """
+    Порівнює результати з базовими.
+
+    Returns:
+        list[str]: Опис кожного випадку, де швидкість впала або пам'ять
+        зросла більше ніж на tolerance.
+    """
+    regressions = []
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            continue
+        if result["iterations_per_second"] < reference["iterations_per_second"] * (1 - tolerance):
+            regressions.append(
+                f"{name}: {result['iterations_per_second']:.1f} ітер/с замість {reference['iterations_per_second']:.1f}"
+            )
+        if None not in (result["peak_rss_mb"], reference["peak_rss_mb"]) and result["peak_rss_mb"] > reference["peak_rss_mb"] * (1 + tolerance):
+            regressions.append(f"{name}: пік RSS {result['peak_rss_mb']:.0f} МБ замість {reference['peak_rss_mb']:.0f} МБ")
+    return regressions
+
+
+def load_json(path, default):
+    if not os.path.exists(path):
+        return default
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_json(data, path):
+    # Запис через тимчасовий файл, щоб аварійне завершення не пошкодило історію
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(data, f, indent=1)
+    os.replace(tmp_path, path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарки моделей і реплікаторної динаміки.")
+    parser.add_argument("--max-population", type=int, default=POPULATION_SCALES[-1])
+    parser.add_argument("--max-batch", type=int, default=BATCH_SCALES[-1])
+    parser.add_argument("--tolerance", type=float, default=0.1, help="Допустиме погіршення (частка).")
+    parser.add_argument("--save-baseline", action="store_true", help="Зберегти результати як базові.")
+    parser.add_argument("--history", default=HISTORY_FILE)
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    args = parser.parse_args()
+
+    results = run_benchmarks(benchmark_cases(args.max_population, args.max_batch))
+    entry = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "results": results,
+    }
+    history = load_json(args.history, [])
+    history.append(entry)
+    save_json(history, args.history)
+
+    baseline = load_json(args.baseline, {})
+    regressions = find_regressions(results, baseline, args.tolerance)
+    if regressions:
+        print("Регресії відносно базових результатів:")
+        for line in regressions:
+            print(f"  {line}")
+    elif baseline:
+        print("Регресій не виявлено.")
+    if args.save_baseline or not baseline:
+        save_json({**baseline, **results}, args.baseline)
+        print(f"Базові результати збережено у {args.baseline}.")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
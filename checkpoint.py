@@ -0,0 +1,103 @@
+import json
+import os
+import shutil
+
+import numpy as np
+
+from engine import Population, Simulation, find_model
+from statistics_sink import MemorySink, StreamingSink
+
+# Контрольна точка — каталог: state.json (налаштування, лічильник ітерацій,
+# когорти ресурсів, стан генераторів), population_<поле>.npy і для статистики
+# в пам'яті statistics_<стовпчик>.npy
+CHECKPOINT_FORMAT = "war-checkpoint-v1"
+STATE_FILE = "state.json"
+
+
+def _json_default(value):
+    # Скаляри NumPy (кількості ресурсів, значення рядка статистики)
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Непідтримуваний тип {type(value).__name__}")
+
+
+def save_checkpoint(simulation, path):
+    """
+    Зберігає повний стан симуляції у каталог path.
+
+    Запис іде у тимчасовий каталог, який потім замінює попередню контрольну
+    точку, тож перерваний запис не пошкоджує її. Для потокової статистики
+    файл дописується на диск, а в контрольній точці зберігаються його шлях
+    і кількість рядків.
+
+    Parameters:
+        simulation (Simulation): Симуляція.
+        path (str): Каталог контрольної точки.
+    """
+    arrays, state = simulation.checkpoint_state()
+    state["format"] = CHECKPOINT_FORMAT
+    sink = simulation.sink
+    if isinstance(sink, StreamingSink):
+        sink.flush()
+        state["statistics"] = {"path": os.path.abspath(sink.path), "rows": sink.rows, "chunk_size": sink.chunk_size}
+    else:
+        state["statistics"] = {"columns": list(sink.columns)}
+
+    tmp_path = path.rstrip(os.sep) + ".tmp"
+    if os.path.exists(tmp_path):
+        shutil.rmtree(tmp_path)
+    os.makedirs(tmp_path)
+    for name, values in arrays.items():
+        np.save(os.path.join(tmp_path, f"population_{name}.npy"), values)
+    if not isinstance(sink, StreamingSink):
+        for name, values in sink.columns.items():
+            np.save(os.path.join(tmp_path, f"statistics_{name}.npy"), np.asarray(values))
+    with open(os.path.join(tmp_path, STATE_FILE), "w") as f:
+        json.dump(state, f, default=_json_default)
+
+    old_path = path.rstrip(os.sep) + ".old"
+    if os.path.exists(path):
+        os.replace(path, old_path)
+    os.replace(tmp_path, path)
+    if os.path.exists(old_path):
+        shutil.rmtree(old_path)
+
+
+def load_checkpoint(path, instrument=False, storage=None):
+    """
+    Відновлює симуляцію з контрольної точки save_checkpoint().
+
+    Масиви відображаються у пам'ять і копіюються в буфери популяції по одному
+    стовпчику, тож піковий обсяг пам'яті не подвоюється. Продовжена симуляція
+    дає ті самі результати, що й запуск без перерви. Потокова статистика
+    продовжує той самий файл (рядки після контрольної точки відкидаються).
+
+    Parameters:
+        path (str): Каталог контрольної точки.
+        instrument (bool): Увімкнути instrumentation.
+        storage (str | None): Каталог для MemmapPopulation (популяція поза
+            оперативною пам'яттю); None — звичайна Population.
+
+    Returns:
+        Simulation: Відновлена симуляція.
+    """
+    with open(os.path.join(path, STATE_FILE)) as f:
+        state = json.load(f)
+    if state.get("format") != CHECKPOINT_FORMAT:
+        raise ValueError(f"Каталог {path} не є контрольною точкою.")
+    arrays = {
+        name: np.load(os.path.join(path, f"population_{name}.npy"), mmap_mode="r")
+        for name in Population.FIELDS
+    }
+
+    statistics = state.pop("statistics")
+    if "path" in statistics:
+        sink = StreamingSink(statistics["path"], chunk_size=statistics["chunk_size"])
+        sink.resume(find_model(state["model"], state["settings"]).columns(), statistics["rows"])
+    else:
+        sink = MemorySink()
+        sink.open(statistics["columns"])
+        for name in statistics["columns"]:
+            values = np.load(os.path.join(path, f"statistics_{name}.npy"), mmap_mode="r")
+            sink.columns[name] = values.tolist()
+    return Simulation.from_checkpoint_state(arrays, state, sink, instrument=instrument, storage=storage)
@@ -0,0 +1,1807 @@
+import tempfile
+
+import numpy as np
+
+from resource_ledger import ResourceLedger
+from instrumentation import Instrumentation
+from statistics_sink import MemorySink
+from genealogy import NO_PARENT
+
+# Налаштування моделей за замовчуванням (як у eco_system.py, compete_system.py і war_system.py).
+# POPULATION_LIMIT: None вимикає перевірку на "вибух" популяції.
+# SUPER_INDIVIDUAL_THRESHOLD: якщо задано, популяція, більша за цей поріг,
+# стискається у зважені суперорганізми (merge_phase) замість зупинки за POPULATION_LIMIT.
+# Це наближення: об'єднані організми усереднюються, а напади w хижаків одного
+# рядка припадають на один рядок жертв (див. weighted_war_predation). Для
+# war-моделі (30 зерен, 60 ітерацій) середня чисельність A відхиляється від
+# повного розрахунку приблизно на 6% за порогу 500, 4% за 2000 і 1% за 5000;
+# для кількісних результатів радимо поріг не менше 5000.
+# COMPETITION_MODE: "sequential", "proportional" або "legacy" (див. COMPETITION_MODES).
+# GRID_SIZE: сторона тороїдальної ґратки (див. Grid); None — добре перемішана популяція
+ECO_SETTINGS = {
+    "NUM_ORGANISMS": 50,
+    "NUM_ITERATIONS": 100,
+    "RESOURCE_GENERATION": 10,
+    "RESOURCE_COST": 10,
+    "RESOURCE_REPRODUCTION_COST": 30,
+    "RESOURCE_EXPIRATION": 4,
+    "MUTATION_RATE": 0.1,
+    "PREDATION_RATE": 0.5,
+    "STARTING_RESOURCES": 0,
+    "PREDATION_THRESHOLD": 4,
+    "POPULATION_LIMIT": None,
+    "SUPER_INDIVIDUAL_THRESHOLD": None,
+    "COMPETITION_MODE": "sequential",
+    "GRID_SIZE": None,
+}
+
+COMPETE_SETTINGS = {
+    "NUM_ORGANISMS_A": 40,
+    "NUM_ORGANISMS_B": 10,
+    "NUM_ITERATIONS": 100,
+    "RESOURCE_GENERATION": 50,
+    "RESOURCE_COST": 10,
+    "RESOURCE_REPRODUCTION_COST_A": 20,
+    "RESOURCE_REPRODUCTION_COST_B": 50,
+    "RESOURCE_EXPIRATION": 4,
+    "MUTATION_RATE": 0.1,
+    "PREDATION_THRESHOLD": 5,
+    "STARTING_RESOURCES": 50,
+    "PREDATION_GAIN": 40,
+    "POPULATION_LIMIT": None,
+    "SUPER_INDIVIDUAL_THRESHOLD": None,
+    "COMPETITION_MODE": "sequential",
+    "GRID_SIZE": None,
+}
+
+DEFAULT_SETTINGS = {
+    "NUM_ORGANISMS_A": 100,
+    "NUM_ORGANISMS_B": 90,
+    "NUM_ITERATIONS": 50,
+    "RESOURCE_GENERATION": 20,
+    "RESOURCE_COST": 10,
+    "RESOURCE_REPRODUCTION_COST_A": 21,
+    "RESOURCE_REPRODUCTION_COST_B": 60,
+    "RESOURCE_EXPIRATION": 3,
+    "EXPIRED": 8,
+    "MUTATION_RATE": 0.1,
+    "PREDATION_THRESHOLD": 4,
+    "STARTING_RESOURCES": 160,
+    "PREDATION_GAIN": 40,
+    "ESCAPE_CHANCE": 0.3,
+    "COUNTERATTACK_CHANCE_FACTOR": 0.1,
+    "POPULATION_LIMIT": 10000,
+    "SUPER_INDIVIDUAL_THRESHOLD": None,
+    "COMPETITION_MODE": "sequential",
+    "GRID_SIZE": None,
+}
+WAR_SETTINGS = DEFAULT_SETTINGS
+
+# Модель з харчовою мережею (food_web_model): K = len(FOOD_WEB) видів,
+# FOOD_WEB[i][j] = 1, якщо вид i полює на вид j. Параметри виду мають
+# суфікс його літери (species_key): A — рослиноїдні, B — хижаки, що полюють
+# на A, C — верхівкові хижаки, що полюють на A і B
+FOOD_WEB_SETTINGS = {
+    "FOOD_WEB": [
+        [0, 0, 0],
+        [1, 0, 0],
+        [1, 1, 0],
+    ],
+    "NUM_ORGANISMS_A": 100,
+    "NUM_ORGANISMS_B": 60,
+    "NUM_ORGANISMS_C": 20,
+    "NUM_ITERATIONS": 50,
+    "RESOURCE_GENERATION": 20,
+    "RESOURCE_COST": 10,
+    "RESOURCE_REPRODUCTION_COST_A": 21,
+    "RESOURCE_REPRODUCTION_COST_B": 60,
+    "RESOURCE_REPRODUCTION_COST_C": 90,
+    "REPRODUCTION_TURNS_A": 3,
+    "REPRODUCTION_TURNS_B": 7,
+    "REPRODUCTION_TURNS_C": 9,
+    "EFFICIENCY_FACTOR_A": 1.0,
+    "EFFICIENCY_FACTOR_B": 0.5,
+    "EFFICIENCY_FACTOR_C": 0.5,
+    "PREDATION_THRESHOLD_A": 4,
+    "PREDATION_THRESHOLD_B": 4,
+    "PREDATION_THRESHOLD_C": 3,
+    "ESCAPE_CHANCE_A": 0.3,
+    "ESCAPE_CHANCE_B": 0.4,
+    "ESCAPE_CHANCE_C": 0.5,
+    "COUNTERATTACK_CHANCE_FACTOR_A": 0.1,
+    "COUNTERATTACK_CHANCE_FACTOR_B": 0.2,
+    "COUNTERATTACK_CHANCE_FACTOR_C": 0.3,
+    "RESOURCE_EXPIRATION": 3,
+    "EXPIRED": 8,
+    "MUTATION_RATE": 0.1,
+    "STARTING_RESOURCES": 160,
+    "POPULATION_LIMIT": 10000,
+    "SUPER_INDIVIDUAL_THRESHOLD": None,
+    "COMPETITION_MODE": "sequential",
+    "GRID_SIZE": None,
+}
+
+# Ідентифікатори видів у стовпчику species
+SPECIES_A = 0
+SPECIES_B = 1
+
+# Літери видів для ключів налаштувань моделі з харчовою мережею
+SPECIES_LETTERS = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+# Розмір блоку для фаз, що будують списки Python або тимчасові масиви
+# пропорційно кількості хижаків чи народжених (пам'ять не росте з популяцією)
+CHUNK_SIZE = 1 << 20
+
+
+# Незалежні потоки випадкових чисел для кожної фази
+class RandomStreams:
+    """
+    Набір генераторів numpy.random.Generator, породжених (spawn) з одного
+    SeedSequence: по одному на фазу. Кожна фаза бере випадкові числа лише зі
+    свого потоку і одразу для всіх організмів, тож зміна кількості викликів
+    в одній фазі не зсуває решту, а запуск з тим самим seed відтворюється
+    біт-у-біт (також у паралельних процесах batch_runner і sweep).
+
+    Parameters:
+        seed (int | np.random.SeedSequence | None): Зерно; None — випадкове.
+    """
+
+    NAMES = ("initial", "shuffle", "predation", "escape", "mutation", "merge", "movement")
+
+    def __init__(self, seed=None):
+        seed_sequence = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+        self.seed_sequence = seed_sequence
+        for name, child in zip(self.NAMES, seed_sequence.spawn(len(self.NAMES))):
+            setattr(self, name, np.random.default_rng(child))
+
+    def state(self):
+        """Стан усіх генераторів (JSON-сумісний словник)."""
+        return {name: getattr(self, name).bit_generator.state for name in self.NAMES}
+
+    @classmethod
+    def from_state(cls, state):
+        """Відновлює потоки зі state(); подальші числа збігаються біт-у-біт."""
+        streams = cls.__new__(cls)
+        streams.seed_sequence = None
+        for name in cls.NAMES:
+            generator = np.random.Generator(np.random.PCG64())
+            generator.bit_generator.state = state[name]
+            setattr(streams, name, generator)
+        return streams
+
+
+# Популяція у вигляді паралельних масивів (structure of arrays)
+class Population:
+    """
+    Сховище організмів: кожен атрибут Organism зберігається окремим масивом NumPy.
+
+    Атрибути efficiency, resources, ... є представленнями (views) на перші
+    `size` елементів буферів і оновлюються після кожної зміни розміру.
+
+    Щоб ітерація не виділяла пам'ять, популяція також тримає запасний буфер
+    для кожного типу даних (keep і permute пишуть у нього, а потім буфери
+    міняються місцями) і робочі масиви scratch(), які перевикористовуються
+    між ітераціями.
+
+    Стовпчик cell — номер клітинки ґратки (лише з GRID_SIZE, інакше 0).
+    Стовпчик weight — кількість однакових організмів, яких представляє
+    рядок (суперорганізм); поки merge_phase нічого не об'єднала, усі ваги
+    дорівнюють 1 і weighted хибне, тож фази працюють як без ваг.
+    Стовпчик id (номер організму в Genealogy) є лише з lineage=True, тож без
+    родоводу перестановки й ущільнення не копіюють зайвий стовпчик.
+    """
+
+    FIELDS = {
+        "efficiency": np.float64,
+        "resources": np.float64,
+        "no_resources_turns": np.int32,
+        "reproduction_ready_turns": np.int32,
+        "time_since_last_reproduction": np.int32,
+        "age": np.int32,
+        "species": np.int8,
+        "weight": np.int64,
+        "cell": np.int32,
+    }
+    LINEAGE_FIELDS = {"id": np.int64}
+
+    def __init__(self, capacity=1024, lineage=False):
+        self.size = 0
+        self.weighted = False
+        self.lineage = lineage
+        fields = {**self.FIELDS, **(self.LINEAGE_FIELDS if lineage else {})}
+        self._buffers = {name: self._allocate(capacity, dtype) for name, dtype in fields.items()}
+        self._spares = {np.dtype(dtype): self._allocate(capacity, dtype) for dtype in set(fields.values())}
+        self._scratch = {}
+        self._range = self._arange(capacity)
+        self._refresh_views()
+
+    def __len__(self):
+        return self.size
+
+    def _allocate(self, size, dtype):
+        """Новий заповнений нулями буфер; MemmapPopulation розміщує його у файлі."""
+        return np.zeros(size, dtype)
+
+    def _arange(self, size):
+        result = self._allocate(size, np.intp)
+        for start in range(0, size, CHUNK_SIZE):
+            end = min(start + CHUNK_SIZE, size)
+            result[start:end] = np.arange(start, end)
+        return result
+
+    @classmethod
+    def from_arrays(cls, arrays, **kwargs):
+        """
+        Популяція з готових стовпчиків (наприклад, відображених у пам'ять
+        масивів контрольної точки): кожен стовпчик копіюється один раз.
+        kwargs передаються конструктору (directory для MemmapPopulation).
+        """
+        size = len(arrays["species"])
+        population = cls(capacity=max(1024, size), **kwargs)
+        for name, buffer in population._buffers.items():
+            buffer[:size] = arrays[name]
+        population.size = size
+        population._refresh_views()
+        population.weighted = bool(np.any(population.weight != 1))
+        return population
+
+    def _refresh_views(self):
+        for name, buffer in self._buffers.items():
+            setattr(self, name, buffer[:self.size])
+
+    def _reserve(self, capacity):
+        current = len(self._buffers["species"])
+        if capacity <= current:
+            return
+        new_capacity = max(capacity, 2 * current)
+        for name, buffer in self._buffers.items():
+            grown = self._allocate(new_capacity, buffer.dtype)
+            grown[:self.size] = buffer[:self.size]
+            self._buffers[name] = grown
+        self._spares = {dtype: self._allocate(new_capacity, dtype) for dtype in self._spares}
+        self._range = self._arange(new_capacity)
+
+    def scratch(self, name, dtype, size=None):
+        """
+        Робочий масив name довжини size (за замовчуванням len(population)).
+        Пам'ять виділяється лише тоді, коли масив потрібно збільшити;
+        вміст не ініціалізується.
+        """
+        size = self.size if size is None else size
+        buffer = self._scratch.get(name)
+        if buffer is None or len(buffer) < size:
+            buffer = self._allocate(max(size, len(self._range)), dtype)
+            self._scratch[name] = buffer
+        return buffer[:size]
+
+    def indices(self, mask, name):
+        """Індекси, де mask істинна (як np.flatnonzero), у робочому масиві name."""
+        # Позиція кожного відібраного елемента — накопичена сума mask (з 1);
+        # невідібрані отримують позицію 0 і записуються у нульовий слот
+        positions = self.scratch("positions", np.intp, len(mask))
+        np.copyto(positions, mask)
+        np.cumsum(positions, out=positions)
+        count = int(positions[-1]) if len(mask) else 0
+        np.multiply(positions, mask, out=positions)
+        result = self.scratch(name, np.intp, count + 1)
+        np.put(result, positions, self._range[:len(mask)], mode="clip")
+        return result[1:]
+
+    def species_index(self):
+        """Стовпчик species як np.intp (робочий масив) для take і bincount без перетворення типів."""
+        species = self.scratch("species_index", np.intp)
+        np.copyto(species, self.species)
+        return species
+
+    def total(self, mask=None):
+        """Кількість організмів з урахуванням ваг (лише там, де mask істинна)."""
+        if not self.weighted:
+            return self.size if mask is None else int(np.count_nonzero(mask))
+        return int(np.sum(self.weight, where=True if mask is None else mask))
+
+    def add(self, species, efficiency, resources, weight=1, cell=0, ids=None):
+        """
+        Додає нових організмів у кінець популяції.
+
+        Parameters:
+            species (int | np.ndarray): Номер виду в Model.species (SPECIES_A, SPECIES_B, ...).
+            efficiency (np.ndarray): Ефективність кожного нового організму.
+            resources (float | np.ndarray): Стартові ресурси.
+            weight (int | np.ndarray): Кількість організмів, яких представляє кожен рядок.
+            cell (int | np.ndarray): Клітинка ґратки.
+            ids (np.ndarray | None): Значення стовпчика id (лише з lineage=True).
+        """
+        efficiency = np.asarray(efficiency, dtype=np.float64)
+        count = len(efficiency)
+        start, end = self.size, self.size + count
+        self._reserve(end)
+        for name, buffer in self._buffers.items():
+            buffer[start:end] = 0
+        self._buffers["species"][start:end] = species
+        self._buffers["efficiency"][start:end] = efficiency
+        self._buffers["resources"][start:end] = resources
+        self._buffers["weight"][start:end] = weight
+        self._buffers["cell"][start:end] = cell
+        if ids is not None:
+            self._buffers["id"][start:end] = ids
+        self.size = end
+        self._refresh_views()
+
+    def keep(self, mask):
+        """Залишає лише організми, для яких mask істинна (одне ущільнення масивів)."""
+        kept_indices = self.indices(mask, "kept")
+        kept = len(kept_indices)
+        for name, buffer in self._buffers.items():
+            spare = self._spares[buffer.dtype]
+            np.take(buffer[:self.size], kept_indices, out=spare[:kept], mode="clip")
+            self._buffers[name], self._spares[buffer.dtype] = spare, buffer
+        self.size = kept
+        self._refresh_views()
+
+    def permute(self, order):
+        """Переставляє організми у порядку order (аналог random.shuffle)."""
+        for name, buffer in self._buffers.items():
+            spare = self._spares[buffer.dtype]
+            np.take(buffer[:self.size], order, out=spare[:self.size], mode="clip")
+            self._buffers[name], self._spares[buffer.dtype] = spare, buffer
+        self._refresh_views()
+
+    def shuffle(self, rng):
+        """Випадкова перестановка; те саме, що permute(rng.permutation(len(population)))."""
+        order = self.scratch("order", np.intp)
+        order[:] = self._range[:self.size]
+        rng.shuffle(order)
+        self.permute(order)
+
+    def counts(self, num_species=2):
+        return np.bincount(self.species_index(), minlength=num_species)
+
+
+# Популяція поза оперативною пам'яттю: буфери у файлах, відображених у пам'ять
+class MemmapPopulation(Population):
+    """
+    Population, у якої всі буфери (стовпчики, запасні й робочі масиви) —
+    np.memmap в анонімних тимчасових файлах каталогу directory. Ядро
+    симуляції працює з ними так само, як зі звичайними масивами (операції
+    з out= і запис у запасні буфери), а операційна система тримає в
+    оперативній пам'яті лише сторінки, з якими зараз працюють, тож
+    популяція може бути більшою за оперативну пам'ять.
+
+    Послідовні проходи (конкуренція, виживання, статистика) читають файли
+    потоково; перемішування і ущільнення звертаються до довільних позицій,
+    тож для популяцій, значно більших за оперативну пам'ять, їхня швидкість
+    обмежена диском.
+
+    Parameters:
+        directory (str | None): Каталог для файлів (None — системний тимчасовий).
+        capacity (int): Початкова ємність.
+        lineage (bool): Додати стовпчик id для Genealogy.
+    """
+
+    def __init__(self, directory=None, capacity=1024, lineage=False):
+        self.directory = directory
+        super().__init__(capacity, lineage)
+
+    def _allocate(self, size, dtype):
+        # Новий файл заповнений нулями; він видаляється, щойно буфер більше не використовується.
+        # Звичайний ndarray над відображенням: індексування np.memmap у циклах хижацтва повільне
+        mapped = np.memmap(tempfile.TemporaryFile(dir=self.directory), dtype=dtype, mode="w+", shape=(size,))
+        return np.asarray(mapped)
+
+
+# Клас для просторової ґратки з індексом клітинок (cell list)
+class Grid:
+    """
+    Тороїдальна ґратка size x size клітинок. Кожен організм має номер
+    клітинки (стовпчик cell) і на кожній ітерації переходить у випадкову
+    клітинку свого околу Мура (3 x 3, включно з поточною). Після arrange()
+    популяція впорядкована за клітинками: організми клітинки c займають
+    позиції start[c]:start[c + 1]. За цим індексом конкуренція йде в межах
+    клітинки, а хижак шукає жертв лише у 9 сусідніх клітинках, тож вартість
+    взаємодій залежить від локальної щільності, а не від розміру популяції.
+
+    Ресурси відновлюються в кожній клітинці окремо (RESOURCE_GENERATION^2,
+    поділене на кількість клітинок) і витрачаються там, де їх спожили.
+    Добре перемішана популяція (GRID_SIZE = None), як і вихідна модель, не
+    забирає спожиті ресурси з пулу — вони лише старіють і зникають, тож
+    GRID_SIZE = 1 не еквівалентна їй: там пул за ітерацію зменшується на
+    спожите.
+
+    Parameters:
+        size (int): Сторона ґратки (GRID_SIZE).
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.cells = size * size
+        self.start = np.zeros(self.cells + 1, dtype=np.intp)
+
+    def place(self, rng, count):
+        """Випадкові клітинки для count нових організмів."""
+        return rng.integers(0, self.cells, count)
+
+    def neighbourhood(self, cells):
+        """Таблиця len(cells) x 9: клітинки околу Мура кожної клітинки (включно з нею)."""
+        rows, columns = np.divmod(np.asarray(cells, dtype=np.intp), self.size)
+        offsets = np.array([-1, 0, 1])
+        rows = (rows[:, None, None] + offsets[None, :, None]) % self.size
+        columns = (columns[:, None, None] + offsets[None, None, :]) % self.size
+        return (rows * self.size + columns).reshape(len(rows), 9)
+
+    def move(self, population, rng):
+        """Кожен організм переходить у випадкову клітинку свого околу."""
+        step = rng.integers(0, 9, len(population))
+        rows, columns = np.divmod(population.cell, self.size)
+        rows += step // 3 - 1
+        columns += step % 3 - 1
+        np.mod(rows, self.size, out=rows)
+        np.mod(columns, self.size, out=columns)
+        population.cell[:] = rows * self.size + columns
+
+    def arrange(self, population, movement_rng, shuffle_rng):
+        """
+        Рух, випадкове перемішування і стабільне впорядкування за клітинками
+        (порядок усередині клітинки залишається випадковим); оновлює start.
+        """
+        self.move(population, movement_rng)
+        population.shuffle(shuffle_rng)
+        population.permute(np.argsort(population.cell, kind="stable"))
+        np.cumsum(np.bincount(population.cell, minlength=self.cells), out=self.start[1:])
+
+    def index(self, cells):
+        """Початки клітинок (len = cells + 1) для впорядкованого за клітинками масиву cells."""
+        start = np.zeros(self.cells + 1, dtype=np.intp)
+        np.cumsum(np.bincount(cells, minlength=self.cells), out=start[1:])
+        return start
+
+    def exclusive_cumsum(self, population, values, out):
+        """Сума values попередніх організмів тієї ж клітинки (після arrange())."""
+        np.cumsum(values, out=out)
+        prefix = np.concatenate(([0.0], out))[self.start[:-1]]  # Сума до початку кожної клітинки
+        np.subtract(out, values, out=out)
+        np.subtract(out, prefix[population.cell], out=out)
+        return out
+
+    def consumed(self, population, gained):
+        """Ресурси, спожиті в кожній клітинці (gained — приріст ресурсів кожного організму)."""
+        return np.bincount(population.cell, weights=gained, minlength=self.cells)
+
+
+def _neighbour_slot(neighbours, counts, starts, pick):
+    """
+    Слот випадкового кандидата з клітинок neighbours (рівномірно серед усіх
+    живих кандидатів околу), або None, якщо кандидатів немає.
+
+    Returns:
+        tuple[int, int] | None: (клітинка, слот у масиві кандидатів).
+    """
+    available = 0
+    for cell in neighbours:
+        available += counts[cell]
+    if available == 0:
+        return None
+    k = int(pick * available)
+    for cell in neighbours:
+        if k < counts[cell]:
+            return cell, starts[cell] + k
+        k -= counts[cell]
+    return None  # Лише через похибку округлення pick * available
+
+
+# Правила конкуренції: (population, total_available_resources, settings, grid) -> None.
+# З ґраткою total_available_resources — масив по клітинках, і кожна клітинка
+# ділить свій пул окремо.
+# COMPETITION_MODE обирає, як ділиться пул ресурсів:
+#   "sequential"   — організми у випадковому порядку (після shuffle) забирають
+#                    свої заявки, доки пул не вичерпано; старіють усі;
+#   "proportional" — незалежно від порядку: кожен отримує свою заявку, а якщо
+#                    заявок більше, ніж ресурсів, — пропорційну частку пулу;
+#   "legacy"       — як цикл об'єктної моделі: перебір зупиняється, щойно
+#                    залишок непозитивний, і організми після зупинки не старіють
+#                    (для відтворення старих результатів; без GRID_SIZE
+#                    і SUPER_INDIVIDUAL_THRESHOLD).
+COMPETITION_MODES = ("sequential", "proportional", "legacy")
+
+
+def _first_stop(population, before):
+    """Номер першого організму, перед яким залишок непозитивний (або len(population))."""
+    stopped = population.scratch("stopped", bool)
+    np.less_equal(before, 0, out=stopped)
+    first = int(np.argmax(stopped))
+    return first if stopped[first] else len(stopped)
+
+
+def _competition_mode(settings):
+    mode = settings["COMPETITION_MODE"]
+    if mode not in COMPETITION_MODES:
+        raise ValueError(f"Невідомий COMPETITION_MODE: {mode!r} (можливі: {', '.join(COMPETITION_MODES)}).")
+    if mode == "legacy" and settings["GRID_SIZE"] is not None:
+        raise ValueError("COMPETITION_MODE \"legacy\" не підтримує GRID_SIZE.")
+    # Зупинка перебору по рядках суперорганізмів не відтворює послідовність окремих організмів
+    if mode == "legacy" and settings["SUPER_INDIVIDUAL_THRESHOLD"] is not None:
+        raise ValueError("COMPETITION_MODE \"legacy\" не підтримує SUPER_INDIVIDUAL_THRESHOLD.")
+    return mode
+
+
+def _proportional_share(population, claims, total_available_resources):
+    """Кожен рядок отримує claims, зменшені в total / sum(claims) разів, якщо пулу не вистачає."""
+    claimed = float(claims.sum())
+    scale = min(1.0, total_available_resources / claimed) if claimed > 0 else 0.0
+    np.multiply(claims, scale, out=claims)
+    if population.weighted:
+        np.divide(claims, population.weight, out=claims)
+    population.resources += claims
+
+
+def proportional_competition(population, total_available_resources, settings, grid=None):
+    """
+    Конкуренція за ресурси (eco_system, war_system): кожен організм по черзі
+    забирає частку efficiency від залишку (не більше за весь залишок), тож
+    залишок перед i-м організмом — total * (1 - e_0) * ... * (1 - e_{i-1}).
+    У режимі "proportional" заявка організму — efficiency * total.
+
+    Суперорганізм з вагою w забирає свою частку w разів поспіль: залишок
+    множиться на (1 - e)^w, а кожен з w організмів отримує середнє.
+    """
+    n = len(population)
+    if n == 0:
+        return
+    mode = _competition_mode(settings)
+    if grid is not None:
+        _grid_proportional_competition(population, total_available_resources, mode, grid)
+        return
+    if mode == "legacy":
+        _legacy_proportional_competition(population, total_available_resources)
+        return
+    population.age += 1
+    if mode == "proportional":
+        claims = population.scratch("claims", np.float64)
+        np.multiply(population.efficiency, total_available_resources, out=claims)
+        if population.weighted:
+            np.multiply(claims, population.weight, out=claims)
+        _proportional_share(population, claims, total_available_resources)
+        return
+
+    # Частка залишку, яку забирає організм, і множник залишку після нього
+    share = population.scratch("share", np.float64)
+    remaining = population.scratch("remaining", np.float64)
+    np.minimum(population.efficiency, 1.0, out=share)
+    np.subtract(1.0, share, out=remaining)
+    if population.weighted:
+        # Частка на одного з w організмів: (1 - (1 - e)^w) / w
+        np.power(remaining, population.weight, out=remaining)
+        np.subtract(1.0, remaining, out=share)
+        np.divide(share, population.weight, out=share)
+    before = population.scratch("before", np.float64)
+    before[0] = total_available_resources
+    before[1:] = remaining[:-1]
+    np.cumprod(before, out=before)
+    np.multiply(before, share, out=before)
+    population.resources += before
+
+
+def _grid_proportional_competition(population, pools, mode, grid):
+    """proportional_competition у кожній клітинці: залишок перед організмом — через суму логарифмів."""
+    population.age += 1
+    pool = pools[population.cell]
+    if mode == "proportional":
+        claims = np.multiply(population.efficiency, pool)
+        claimed = np.bincount(population.cell, weights=claims, minlength=grid.cells)
+        scale = np.minimum(1.0, np.divide(pools, claimed, out=np.zeros(grid.cells), where=claimed > 0))
+        population.resources += claims * scale[population.cell]
+        return
+    share = np.minimum(population.efficiency, 1.0)
+    # log(1 - e); для e >= 1 залишок нульовий, тож логарифм обмежено знизу
+    logs = np.log(np.maximum(1.0 - share, 1e-300))
+    before = grid.exclusive_cumsum(population, logs, np.empty(len(population)))
+    np.exp(before, out=before)
+    population.resources += pool * before * share
+
+
+# Лише без суперорганізмів: _competition_mode не допускає "legacy" з SUPER_INDIVIDUAL_THRESHOLD
+def _legacy_proportional_competition(population, total_available_resources):
+    n = len(population)
+    before = population.scratch("before", np.float64)
+    before[0] = 1.0
+    np.subtract(1.0, population.efficiency[:-1], out=before[1:])
+    np.cumprod(before, out=before)
+    np.multiply(before, total_available_resources, out=before)
+    competing = _first_stop(population, before)
+    population.age[:min(competing + 1, n)] += 1
+    np.multiply(before[:competing], population.efficiency[:competing], out=before[:competing])
+    population.resources[:competing] += before[:competing]
+
+
+def claim_competition(population, total_available_resources, settings, grid=None):
+    """
+    Конкуренція за ресурси (compete_system): заявка організму —
+    max(RESOURCE_COST, efficiency). У режимі "sequential" накопичена сума
+    заявок ріже пул (searchsorted): організми до межі отримують заявку
+    повністю, організм на межі — залишок, решта — нічого.
+    Заявка суперорганізму — заявка одного організму, помножена на вагу.
+    """
+    n = len(population)
+    if n == 0:
+        return
+    mode = _competition_mode(settings)
+    claims = population.scratch("claims", np.float64)
+    np.maximum(settings["RESOURCE_COST"], population.efficiency, out=claims)
+    if grid is not None:
+        _grid_claim_competition(population, total_available_resources, claims, mode, grid)
+        return
+    if population.weighted:
+        np.multiply(claims, population.weight, out=claims)
+    if mode == "legacy":
+        _legacy_claim_competition(population, total_available_resources, claims)
+        return
+    population.age += 1
+    if mode == "proportional":
+        _proportional_share(population, claims, total_available_resources)
+        return
+
+    cumulative = population.scratch("before", np.float64)
+    np.cumsum(claims, out=cumulative)
+    satisfied = int(np.searchsorted(cumulative, total_available_resources, side="right"))
+    if population.weighted:
+        np.divide(claims[:satisfied + 1], population.weight[:satisfied + 1], out=claims[:satisfied + 1])
+    population.resources[:satisfied] += claims[:satisfied]
+    if satisfied < n:
+        rest = total_available_resources - (cumulative[satisfied - 1] if satisfied else 0.0)
+        population.resources[satisfied] += rest / population.weight[satisfied] if population.weighted else rest
+
+
+def _grid_claim_competition(population, pools, claims, mode, grid):
+    """claim_competition у кожній клітинці: заявки віднімаються від пулу своєї клітинки."""
+    population.age += 1
+    if mode == "proportional":
+        claimed = np.bincount(population.cell, weights=claims, minlength=grid.cells)
+        scale = np.minimum(1.0, np.divide(pools, claimed, out=np.zeros(grid.cells), where=claimed > 0))
+        population.resources += claims * scale[population.cell]
+        return
+    before = grid.exclusive_cumsum(population, claims, np.empty(len(population)))
+    np.subtract(pools[population.cell], before, out=before)
+    np.clip(before, 0.0, claims, out=before)
+    population.resources += before
+
+
+# Лише без суперорганізмів: _competition_mode не допускає "legacy" з SUPER_INDIVIDUAL_THRESHOLD
+def _legacy_claim_competition(population, total_available_resources, claims):
+    n = len(population)
+    before = population.scratch("before", np.float64)
+    np.cumsum(claims, out=before)
+    np.subtract(before, claims, out=before)
+    np.subtract(total_available_resources, before, out=before)
+    competing = _first_stop(population, before)
+    population.age[:min(competing + 1, n)] += 1
+    np.minimum(claims[:competing], before[:competing], out=claims[:competing])
+    population.resources[:competing] += claims[:competing]
+
+
+# Правила хижацтва: (population, settings, streams, alive, grid) -> dict | None.
+# З ґраткою хижак обирає жертву лише у своєму околі (grid_*_predation).
+# Убиті організми позначаються в alive; ущільнення виконує Simulation.step().
+# Повертають лічильники подій (ключі з Model.event_keys), які рахуються
+# після циклу з уже наявних даних, щоб не сповільнювати сам цикл.
+def stressed_predators(population, settings, species):
+    """Індекси стресованих організмів виду species (у робочому масиві)."""
+    stressed = population.scratch("stressed", bool)
+    condition = population.scratch("condition", bool)
+    np.less(population.resources, settings["RESOURCE_COST"], out=stressed)
+    np.greater(population.time_since_last_reproduction, settings["PREDATION_THRESHOLD"], out=condition)
+    np.logical_or(stressed, condition, out=stressed)
+    np.equal(population.species, species, out=condition)
+    np.logical_and(stressed, condition, out=stressed)
+    return population.indices(stressed, "predators")
+
+
+def eco_predation(population, settings, streams, alive, grid=None):
+    """
+    Хижацтво eco_system: кожен організм, стресований на момент свого ходу,
+    нападає на випадковий організм (окрім себе) і забирає стільки ресурсів,
+    скільки бракує до розмноження (щонайменше RESOURCE_COST). Ніхто не гине.
+
+    Стрес перевіряється на поточних ресурсах, бо їх змінюють попередні
+    напади, тож цикл послідовний; випадкові жертви генеруються одразу.
+    """
+    n = len(population)
+    if n == 0:
+        return
+    if grid is not None:
+        return grid_eco_predation(population, settings, streams, alive, grid)
+    if population.weighted:
+        return weighted_eco_predation(population, settings, streams, alive)
+    cost = settings["RESOURCE_COST"]
+    reproduction_cost = settings["RESOURCE_REPRODUCTION_COST"]
+    waited_too_long = (population.time_since_last_reproduction > settings["PREDATION_THRESHOLD"]).tolist()
+    picks = streams.predation.integers(0, n, n).tolist()
+    resources = population.resources.tolist()
+    for predator in range(n):
+        if resources[predator] >= cost and not waited_too_long[predator]:
+            continue
+        victim = picks[predator]
+        if victim != predator and resources[victim] > 0:
+            stolen = min(max(cost, reproduction_cost - resources[predator]), resources[victim])
+            resources[predator] += stolen
+            resources[victim] -= stolen
+    population.resources[:] = resources
+
+
+def compete_predation(population, settings, streams, alive, grid=None):
+    """
+    Хижацтво compete_system: кожен стресований хижак (B) обирає випадковий
+    організм з усієї популяції; якщо це A з ресурсами, хижак отримує
+    PREDATION_GAIN, а жертва гине. Вбиті видаляються з пулу заміною на
+    останній елемент (O(1)), тож вибір рівномірний серед ще живих. Пул не
+    матеріалізується: зберігаються лише переставлені слоти, тож робота
+    пропорційна кількості хижаків, а не розміру популяції.
+    """
+    if grid is not None:
+        return grid_compete_predation(population, settings, streams, alive, grid)
+    if population.weighted:
+        return weighted_compete_predation(population, settings, streams, alive)
+    predators = stressed_predators(population, settings, SPECIES_B)
+    pool_size = len(population)
+    moved = {}  # Пул — це всі індекси; тут лише слоти, куди перенесено останній елемент
+    gain = settings["PREDATION_GAIN"]
+    species = population.species
+    resources = population.resources
+    # Хижаки обробляються блоками по CHUNK_SIZE; числа з потоку беруться
+    # послідовно, тож результат не залежить від розміру блоку
+    for start in range(0, len(predators), CHUNK_SIZE):
+        chunk = predators[start:start + CHUNK_SIZE].tolist()
+        picks = streams.predation.random(out=population.scratch("picks", np.float64, len(chunk))).tolist()
+        for i, predator in enumerate(chunk):
+            slot = int(picks[i] * pool_size)
+            victim = moved.get(slot, slot)
+            if species[victim] == SPECIES_A and resources[victim] > 0:
+                resources[predator] += gain
+                resources[victim] = 0
+                alive[victim] = False
+                pool_size -= 1
+                moved[slot] = moved.get(pool_size, pool_size)
+    return {"kills": len(population) - pool_size}
+
+
+def war_predation(population, settings, streams, alive, grid=None):
+    """
+    Хижацтво war_system: кожен стресований хижак (B) нападає на випадкову живу жертву (A).
+
+    Жертви зберігаються у пулі індексів, з якого вбиту жертву видаляють
+    заміною на останній елемент (O(1)); переставлені слоти тримаються у
+    словнику, тож пул не копіюється у список Python. Випадкові числа для
+    всіх хижаків генеруються одразу (вибір жертви — з потоку predation,
+    втеча та контратака — з потоку escape), тож цикл виконує O(1) роботи
+    на хижака. Розподіл результатів такий самий, як в OrganismB.prey_on.
+
+    Хижаки обробляються блоками по CHUNK_SIZE. Потік escape містить спершу
+    числа втечі для всіх хижаків, а потім числа контратаки, тож числа
+    контратаки беруться з копії потоку, зсунутої на count позицій (advance);
+    результат не залежить від розміру блоку.
+    """
+    if grid is not None:
+        return grid_war_predation(population, settings, streams, alive, grid)
+    if population.weighted:
+        return weighted_war_predation(population, settings, streams, alive)
+    predators = stressed_predators(population, settings, SPECIES_B)
+    is_victim = population.scratch("is_victim", bool)
+    np.equal(population.species, SPECIES_A, out=is_victim)
+    victims = population.indices(is_victim, "victims")
+    count = len(predators)
+    if count == 0 or victims.size == 0:
+        return {"kills": 0, "escapes": 0, "counterattacks": 0}
+
+    counterattack_stream = np.random.Generator(type(streams.escape.bit_generator)())
+    counterattack_stream.bit_generator.state = streams.escape.bit_generator.state
+    counterattack_stream.bit_generator.advance(count)
+    escape_chance = settings["ESCAPE_CHANCE"]
+    counterattack_factor = settings["COUNTERATTACK_CHANCE_FACTOR"]
+    resources = population.resources
+    efficiency = population.efficiency
+    pool_size = len(victims)
+    moved = {}  # Слоти пулу, куди після вбивства перенесено останню жертву
+    attacks = escapes = drawn = 0
+    for start in range(0, count, CHUNK_SIZE):
+        if pool_size == 0:
+            break  # Жертви закінчились: решта хижаків не нападає
+        chunk = predators[start:start + CHUNK_SIZE].tolist()
+        rolls = population.scratch("rolls", np.float64, len(chunk))
+        picks = streams.predation.random(out=rolls).tolist()
+        escaped = np.less(streams.escape.random(out=rolls), escape_chance, out=population.scratch("escaped", bool, len(chunk))).tolist()
+        counterattack_rolls = counterattack_stream.random(out=rolls).tolist()
+        drawn += len(chunk)
+        for i, predator in enumerate(chunk):
+            if pool_size == 0:
+                break
+            attacks += 1
+            slot = int(picks[i] * pool_size)
+            victim = moved[slot] if slot in moved else int(victims[slot])
+            if escaped[i]:
+                # Жертва втекла, але хижак забирає її ресурси
+                escapes += 1
+                resources[predator] += resources[victim]
+                resources[victim] = 0
+            elif counterattack_rolls[i] < efficiency[victim] * counterattack_factor:
+                alive[predator] = False  # Хижак помер через контратаку
+            else:
+                resources[predator] += resources[victim]
+                resources[victim] = 0
+                alive[victim] = False
+                pool_size -= 1
+                moved[slot] = moved[pool_size] if pool_size in moved else int(victims[pool_size])
+
+    # Потоки зсуваються так, ніби числа були згенеровані для всіх count хижаків
+    streams.predation.bit_generator.advance(count - drawn)
+    counterattack_stream.bit_generator.advance(count - drawn)
+    streams.escape.bit_generator.state = counterattack_stream.bit_generator.state
+
+    kills = len(victims) - pool_size
+    return {"kills": kills, "escapes": escapes, "counterattacks": attacks - escapes - kills}
+
+
+# Хижацтво суперорганізмів: рядок з вагою w — це w однакових організмів.
+# Жертва обирається з імовірністю, пропорційною вазі на початку фази (тобто
+# рівномірно серед організмів), а результати нападів w хижаків рахуються
+# біноміальними розподілами; кількість рядків обмежена порогом, тож цикли
+# на рядок залишаються дешевими. Усі напади рядка хижаків припадають на один
+# рядок жертв, тож убивства в ньому скорельовані; похибка від цього росте,
+# коли поріг малий, а рядки важкі (див. SUPER_INDIVIDUAL_THRESHOLD).
+def _weighted_choice(population, candidates, rng, count):
+    """count випадкових рядків з candidates (None — усі) з імовірністю, пропорційною вазі."""
+    weight = population.weight if candidates is None else population.weight[candidates]
+    cumulative = np.cumsum(weight)
+    picks = np.searchsorted(cumulative, rng.random(count) * cumulative[-1], side="right")
+    return picks if candidates is None else candidates[picks]
+
+
+def weighted_eco_predation(population, settings, streams, alive):
+    """eco_predation для суперорганізмів: w хижаків забирають разом не більше за ресурси всіх w жертв."""
+    n = len(population)
+    cost = settings["RESOURCE_COST"]
+    reproduction_cost = settings["RESOURCE_REPRODUCTION_COST"]
+    waited_too_long = (population.time_since_last_reproduction > settings["PREDATION_THRESHOLD"]).tolist()
+    picks = _weighted_choice(population, None, streams.predation, n).tolist()
+    resources = population.resources.tolist()
+    weight = population.weight.tolist()
+    for predator in range(n):
+        if resources[predator] >= cost and not waited_too_long[predator]:
+            continue
+        victim = picks[predator]
+        if victim != predator and resources[victim] > 0:
+            need = max(cost, reproduction_cost - resources[predator]) * weight[predator]
+            stolen = min(need, resources[victim] * weight[victim])
+            resources[predator] += stolen / weight[predator]
+            resources[victim] -= stolen / weight[victim]
+    population.resources[:] = resources
+
+
+def weighted_compete_predation(population, settings, streams, alive):
+    """
+    compete_predation для суперорганізмів: w хижаків убивають до w організмів
+    обраного рядка A (якщо в нього є ресурси), і кожен успішний хижак отримує PREDATION_GAIN.
+    """
+    predators = stressed_predators(population, settings, SPECIES_B).tolist()
+    if not predators:
+        return {"kills": 0}
+    picks = _weighted_choice(population, None, streams.predation, len(predators)).tolist()
+    gain = settings["PREDATION_GAIN"]
+    species = population.species
+    resources = population.resources
+    weight = population.weight
+    kills = 0
+    for predator, victim in zip(predators, picks):
+        if species[victim] == SPECIES_A and resources[victim] > 0 and weight[victim] > 0:
+            killed = min(weight[predator], weight[victim])
+            resources[predator] += gain * killed / weight[predator]
+            weight[victim] -= killed
+            kills += int(killed)
+            if weight[victim] == 0:
+                resources[victim] = 0
+                alive[victim] = False
+    return {"kills": kills}
+
+
+def weighted_war_predation(population, settings, streams, alive):
+    """
+    war_predation для суперорганізмів: з w_p хижаків рядка на обраний рядок
+    жертв нападають min(w_p, w_v); серед них втечі та контратаки —
+    біноміальні з тими самими ймовірностями, решта — убиті жертви.
+    Здобуті ресурси діляться між хижаками, що вижили, а жертви, що втекли,
+    втрачають ресурси (ресурси рядка — середнє по тих, хто вижив).
+    """
+    predators = stressed_predators(population, settings, SPECIES_B).tolist()
+    is_victim = population.scratch("is_victim", bool)
+    np.equal(population.species, SPECIES_A, out=is_victim)
+    victims = population.indices(is_victim, "victims")
+    if not predators or victims.size == 0:
+        return {"kills": 0, "escapes": 0, "counterattacks": 0}
+
+    picks = _weighted_choice(population, victims, streams.predation, len(predators)).tolist()
+    escape_chance = settings["ESCAPE_CHANCE"]
+    counterattack_factor = settings["COUNTERATTACK_CHANCE_FACTOR"]
+    resources = population.resources
+    efficiency = population.efficiency
+    weight = population.weight
+    kills = escapes = counterattacks = 0
+    for predator, victim in zip(predators, picks):
+        attackers = int(min(weight[predator], weight[victim]))
+        if attackers == 0:
+            continue  # Рядок жертв уже знищено раніше в цій фазі
+        escaped = int(streams.escape.binomial(attackers, escape_chance))
+        countered = int(streams.escape.binomial(attackers - escaped, min(1.0, efficiency[victim] * counterattack_factor)))
+        killed = attackers - escaped - countered
+        taken = resources[victim] * (escaped + killed)
+
+        weight[predator] -= countered
+        if weight[predator] == 0:
+            alive[predator] = False
+        else:
+            resources[predator] += taken / weight[predator]
+        survivors = weight[victim] - killed
+        if survivors == 0:
+            resources[victim] = 0
+            alive[victim] = False
+        else:
+            resources[victim] *= (survivors - escaped) / survivors
+        weight[victim] = survivors
+        kills += killed
+        escapes += escaped
+        counterattacks += countered
+    return {"kills": kills, "escapes": escapes, "counterattacks": counterattacks}
+
+
+# Хижацтво на ґратці: кандидати (усі організми або лише жертви A)
+# впорядковані за клітинками, тож кандидати клітинки c — це слоти
+# starts[c]:starts[c] + counts[c]. Убитого кандидата видаляють з його
+# клітинки заміною на останнього (як у пулі war_predation), а хижак
+# обирає рівномірно серед живих кандидатів 9 клітинок свого околу.
+def grid_eco_predation(population, settings, streams, alive, grid):
+    """eco_predation на ґратці: жертва — випадковий організм з околу хижака (окрім нього самого)."""
+    n = len(population)
+    cost = settings["RESOURCE_COST"]
+    reproduction_cost = settings["RESOURCE_REPRODUCTION_COST"]
+    waited_too_long = (population.time_since_last_reproduction > settings["PREDATION_THRESHOLD"]).tolist()
+    picks = streams.predation.random(n).tolist()
+    neighbours = grid.neighbourhood(population.cell).tolist()
+    counts = np.diff(grid.start).tolist()
+    starts = grid.start.tolist()
+    resources = population.resources.tolist()
+    for predator in range(n):
+        if resources[predator] >= cost and not waited_too_long[predator]:
+            continue
+        found = _neighbour_slot(neighbours[predator], counts, starts, picks[predator])
+        if found is None:
+            continue  # В околі немає кандидатів
+        victim = found[1]
+        if victim != predator and resources[victim] > 0:
+            stolen = min(max(cost, reproduction_cost - resources[predator]), resources[victim])
+            resources[predator] += stolen
+            resources[victim] -= stolen
+    population.resources[:] = resources
+
+
+def grid_compete_predation(population, settings, streams, alive, grid):
+    """compete_predation на ґратці: хижак обирає випадковий організм зі свого околу."""
+    predators = stressed_predators(population, settings, SPECIES_B).tolist()
+    if not predators:
+        return {"kills": 0}
+    picks = streams.predation.random(len(predators)).tolist()
+    neighbours = grid.neighbourhood(population.cell[predators]).tolist()
+    counts = np.diff(grid.start).tolist()
+    starts = grid.start.tolist()
+    moved = {}
+    gain = settings["PREDATION_GAIN"]
+    species = population.species
+    resources = population.resources
+    kills = 0
+    for i, predator in enumerate(predators):
+        found = _neighbour_slot(neighbours[i], counts, starts, picks[i])
+        if found is None:
+            continue  # В околі немає кандидатів
+        cell, slot = found
+        victim = moved.get(slot, slot)
+        if species[victim] == SPECIES_A and resources[victim] > 0:
+            resources[predator] += gain
+            resources[victim] = 0
+            alive[victim] = False
+            kills += 1
+            counts[cell] -= 1
+            last = starts[cell] + counts[cell]
+            moved[slot] = moved.get(last, last)
+    return {"kills": kills}
+
+
+def grid_war_predation(population, settings, streams, alive, grid):
+    """war_predation на ґратці: хижак нападає на випадкову живу жертву A зі свого околу."""
+    predators = stressed_predators(population, settings, SPECIES_B).tolist()
+    is_victim = population.scratch("is_victim", bool)
+    np.equal(population.species, SPECIES_A, out=is_victim)
+    victims = population.indices(is_victim, "victims")
+    if not predators or victims.size == 0:
+        return {"kills": 0, "escapes": 0, "counterattacks": 0}
+
+    count = len(predators)
+    picks = streams.predation.random(count).tolist()
+    escaped = (streams.escape.random(count) < settings["ESCAPE_CHANCE"]).tolist()
+    counterattack_rolls = streams.escape.random(count).tolist()
+    counterattack_factor = settings["COUNTERATTACK_CHANCE_FACTOR"]
+    neighbours = grid.neighbourhood(population.cell[predators]).tolist()
+    victim_start = grid.index(population.cell[victims])
+    counts = np.diff(victim_start).tolist()
+    starts = victim_start.tolist()
+    victims = victims.tolist()
+    resources = population.resources
+    efficiency = population.efficiency
+    moved = {}
+    kills = escapes = counterattacks = 0
+    for i, predator in enumerate(predators):
+        found = _neighbour_slot(neighbours[i], counts, starts, picks[i])
+        if found is None:
+            continue  # В околі немає живих жертв
+        cell, slot = found
+        victim = moved.get(slot, victims[slot])
+        if escaped[i]:
+            escapes += 1
+            resources[predator] += resources[victim]
+            resources[victim] = 0
+        elif counterattack_rolls[i] < efficiency[victim] * counterattack_factor:
+            counterattacks += 1
+            alive[predator] = False
+        else:
+            kills += 1
+            resources[predator] += resources[victim]
+            resources[victim] = 0
+            alive[victim] = False
+            counts[cell] -= 1
+            last = starts[cell] + counts[cell]
+            moved[slot] = moved.get(last, victims[last])
+    return {"kills": kills, "escapes": escapes, "counterattacks": counterattacks}
+
+
+# Хижацтво моделі з харчовою мережею (food_web_model). Вид організму — ціле
+# число у стовпчику species, а параметри видів — масиви, з яких значення
+# беруться через take, тож жодна фаза не перебирає види. Жертви впорядковані
+# за ключем пулу (вид, а на ґратці — клітинка * K + вид), і хижак обирає
+# рівномірно серед живих організмів усіх своїх видів-жертв (на ґратці — лише
+# в околі), видаляючи вбитих заміною на останнього, як у grid_war_predation.
+def species_key(key, species_id):
+    """Ключ налаштувань виду species_id ("ESCAPE_CHANCE", 2 -> "ESCAPE_CHANCE_C")."""
+    return f"{key}_{SPECIES_LETTERS[species_id]}"
+
+
+def food_web_parameters(settings):
+    """
+    Харчова мережа і параметри хижацтва кожного виду.
+
+    Returns:
+        tuple: (FOOD_WEB як масив K x K типу bool, PREDATION_THRESHOLD,
+        ESCAPE_CHANCE, COUNTERATTACK_CHANCE_FACTOR — масиви довжини K).
+    """
+    web = np.asarray(settings["FOOD_WEB"], dtype=bool)
+    num_species = len(web)
+    if web.shape != (num_species, num_species) or num_species > len(SPECIES_LETTERS):
+        raise ValueError(f"FOOD_WEB має бути квадратною матрицею розміром не більше {len(SPECIES_LETTERS)}.")
+    threshold = np.array([settings[species_key("PREDATION_THRESHOLD", i)] for i in range(num_species)], dtype=np.int32)
+    escape_chance = np.array([settings[species_key("ESCAPE_CHANCE", i)] for i in range(num_species)], dtype=np.float64)
+    counterattack_factor = np.array([settings[species_key("COUNTERATTACK_CHANCE_FACTOR", i)] for i in range(num_species)], dtype=np.float64)
+    return web, threshold, escape_chance, counterattack_factor
+
+
+def _food_web_candidates(population, settings, web, threshold):
+    """
+    Стовпчик видів (np.intp), стресовані хижаки (організми видів з ненульовим
+    рядком мережі) і можливі жертви (організми видів з ненульовим стовпчиком).
+    """
+    species = population.species_index()
+    stressed = population.scratch("stressed", bool)
+    condition = population.scratch("condition", bool)
+    np.less(population.resources, settings["RESOURCE_COST"], out=stressed)
+    limit = np.take(threshold, species, out=population.scratch("turns", np.int32), mode="clip")
+    np.greater(population.time_since_last_reproduction, limit, out=condition)
+    np.logical_or(stressed, condition, out=stressed)
+    np.take(web.any(axis=1), species, out=condition, mode="clip")
+    np.logical_and(stressed, condition, out=stressed)
+    predators = population.indices(stressed, "predators")
+    np.take(web.any(axis=0), species, out=condition, mode="clip")
+    victims = population.indices(condition, "victims")
+    return species, predators, victims
+
+
+def food_web_predation(population, settings, streams, alive, grid=None):
+    """
+    Хижацтво в харчовій мережі: кожен стресований організм виду i, для якого
+    FOOD_WEB[i] не нульовий, нападає на випадковий живий організм видів j з
+    FOOD_WEB[i][j] = 1. Стрес визначається як у war_predation, але з
+    PREDATION_THRESHOLD свого виду, а втеча і контратака — з ESCAPE_CHANCE і
+    COUNTERATTACK_CHANCE_FACTOR виду жертви.
+
+    Хижак сам може бути жертвою: убитий раніше в цій фазі вже не нападає, а
+    хижак, що загинув від контратаки, лишається в пулі, і напад на нього
+    (як і на самого себе, якщо вид полює на свій вид) пропускається.
+
+    Вибір жертви береться з потоку predation, втеча і контратака — пара чисел
+    з потоку escape на кожного хижака. Хижаки обробляються блоками по
+    CHUNK_SIZE, і результат не залежить від розміру блоку. Робота на хижака
+    пропорційна кількості його видів-жертв (на ґратці — ще й 9 клітинкам
+    околу), а не K чи розміру популяції.
+    """
+    if population.weighted:
+        return weighted_food_web_predation(population, settings, streams, alive)
+    web, threshold, escape_chance, counterattack_factor = food_web_parameters(settings)
+    num_species = len(web)
+    species, predators, victims = _food_web_candidates(population, settings, web, threshold)
+    if predators.size == 0 or victims.size == 0:
+        return {"kills": 0, "escapes": 0, "counterattacks": 0}
+
+    # Пули жертв: організми з однаковим ключем займають слоти starts[key]:starts[key] + counts[key]
+    keys = species[victims]
+    num_keys = num_species
+    if grid is not None:
+        keys = keys + population.cell[victims] * num_species
+        num_keys = grid.cells * num_species
+    victims = victims[np.argsort(keys, kind="stable")]
+    victim_start = np.zeros(num_keys + 1, dtype=np.intp)
+    np.cumsum(np.bincount(keys, minlength=num_keys), out=victim_start[1:])
+    counts = np.diff(victim_start).tolist()
+    starts = victim_start.tolist()
+    prey = [np.flatnonzero(row).tolist() for row in web]
+    escape_chance = escape_chance.tolist()
+    counterattack_factor = counterattack_factor.tolist()
+    resources = population.resources
+    efficiency = population.efficiency
+    moved = {}  # Слоти пулів, куди після вбивства перенесено останню жертву
+    kills = escapes = counterattacks = 0
+    for start in range(0, predators.size, CHUNK_SIZE):
+        chunk = predators[start:start + CHUNK_SIZE]
+        picks = streams.predation.random(chunk.size).tolist()
+        rolls = streams.escape.random((chunk.size, 2)).tolist()
+        hunters = species[chunk].tolist()
+        neighbours = None if grid is None else grid.neighbourhood(population.cell[chunk]).tolist()
+        for i, predator in enumerate(chunk.tolist()):
+            if not alive[predator]:
+                continue  # Хижака вбили раніше в цій фазі
+            pools = prey[hunters[i]]
+            if neighbours is not None:
+                pools = [cell * num_species + j for cell in neighbours[i] for j in pools]
+            found = _neighbour_slot(pools, counts, starts, picks[i])
+            if found is None:
+                continue  # Немає живих жертв (на ґратці — в околі)
+            key, slot = found
+            victim = moved[slot] if slot in moved else int(victims[slot])
+            if victim == predator or not alive[victim]:
+                continue
+            victim_species = key % num_species
+            escape_roll, counterattack_roll = rolls[i]
+            if escape_roll < escape_chance[victim_species]:
+                # Жертва втекла, але хижак забирає її ресурси
+                escapes += 1
+                resources[predator] += resources[victim]
+                resources[victim] = 0
+            elif counterattack_roll < efficiency[victim] * counterattack_factor[victim_species]:
+                counterattacks += 1
+                alive[predator] = False
+            else:
+                kills += 1
+                resources[predator] += resources[victim]
+                resources[victim] = 0
+                alive[victim] = False
+                counts[key] -= 1
+                last = starts[key] + counts[key]
+                moved[slot] = moved[last] if last in moved else int(victims[last])
+    return {"kills": kills, "escapes": escapes, "counterattacks": counterattacks}
+
+
+def weighted_food_web_predation(population, settings, streams, alive):
+    """
+    food_web_predation для суперорганізмів (як weighted_war_predation): рядок
+    жертв обирається з імовірністю, пропорційною вазі, серед організмів
+    видів-жертв хижака, а втечі та контратаки — біноміальні.
+    """
+    web, threshold, escape_chance, counterattack_factor = food_web_parameters(settings)
+    species, predators, victims = _food_web_candidates(population, settings, web, threshold)
+    if predators.size == 0 or victims.size == 0:
+        return {"kills": 0, "escapes": 0, "counterattacks": 0}
+
+    # Жертви обираються одразу для всіх хижаків кожного виду
+    hunters = species[predators]
+    victim_species = species[victims]
+    picks = np.full(predators.size, -1, dtype=np.intp)
+    for hunter in np.unique(hunters):
+        candidates = victims[web[hunter][victim_species]]
+        if candidates.size:
+            group = np.flatnonzero(hunters == hunter)
+            picks[group] = _weighted_choice(population, candidates, streams.predation, group.size)
+
+    resources = population.resources
+    efficiency = population.efficiency
+    weight = population.weight
+    kills = escapes = counterattacks = 0
+    for predator, victim in zip(predators.tolist(), picks.tolist()):
+        if victim < 0 or victim == predator:
+            continue
+        attackers = int(min(weight[predator], weight[victim]))
+        if attackers == 0:
+            continue  # Рядок хижаків або жертв уже знищено раніше в цій фазі
+        prey_species = species[victim]
+        escaped = int(streams.escape.binomial(attackers, escape_chance[prey_species]))
+        countered = int(streams.escape.binomial(attackers - escaped, min(1.0, efficiency[victim] * counterattack_factor[prey_species])))
+        killed = attackers - escaped - countered
+        taken = resources[victim] * (escaped + killed)
+
+        weight[predator] -= countered
+        if weight[predator] == 0:
+            alive[predator] = False
+        else:
+            resources[predator] += taken / weight[predator]
+        survivors = weight[victim] - killed
+        if survivors == 0:
+            resources[victim] = 0
+            alive[victim] = False
+        else:
+            resources[victim] *= (survivors - escaped) / survivors
+        weight[victim] = survivors
+        kills += killed
+        escapes += escaped
+        counterattacks += countered
+    return {"kills": kills, "escapes": escapes, "counterattacks": counterattacks}
+
+
+def survive_phase(population, resource_cost):
+    fed = population.scratch("fed", bool)
+    hungry = population.scratch("hungry", bool)
+    np.greater_equal(population.resources, resource_cost, out=fed)
+    np.logical_not(fed, out=hungry)
+    np.subtract(population.resources, resource_cost, out=population.resources, where=fed)
+    # Ситі обнуляють лічильник, голодні збільшують: (n + 1) * hungry
+    np.add(population.no_resources_turns, 1, out=population.no_resources_turns)
+    np.multiply(population.no_resources_turns, hungry, out=population.no_resources_turns)
+    np.add(population.time_since_last_reproduction, 1, out=population.time_since_last_reproduction)
+
+
+def reproduction_phase(population, settings, mutation_rng, reproduction_cost, reproduction_turns, efficiency_factor):
+    """
+    Розмноження; reproduction_cost, reproduction_turns (np.int32) і
+    efficiency_factor — масиви з одним значенням на вид.
+
+    Усі w організмів суперорганізму розмножуються разом, і нащадок
+    успадковує вагу w (одна мутація на рядок). Нащадок з'являється у
+    клітинці батька, а з lineage отримує id батька (Simulation замінює його
+    власним id з Genealogy).
+
+    Returns:
+        int: Кількість народжених організмів.
+    """
+    species = population.species_index()
+    cost = np.take(reproduction_cost, species, out=population.scratch("cost", np.float64), mode="clip")
+    ready = population.scratch("ready", bool)
+    np.greater_equal(population.resources, cost, out=ready)
+    # Готові збільшують лічильник, решта обнуляють: (n + 1) * ready
+    np.add(population.reproduction_ready_turns, 1, out=population.reproduction_ready_turns)
+    np.multiply(population.reproduction_ready_turns, ready, out=population.reproduction_ready_turns)
+
+    turns = np.take(reproduction_turns, species, out=population.scratch("turns", np.int32), mode="clip")
+    np.greater_equal(population.reproduction_ready_turns, turns, out=ready)
+    parents = population.indices(ready, "parents")
+    if parents.size == 0:
+        return 0
+    # Решта виділень пропорційна кількості народжених, тож батьки обробляються
+    # блоками по CHUNK_SIZE; мутації беруться з потоку послідовно
+    for start in range(0, parents.size, CHUNK_SIZE):
+        chunk = parents[start:start + CHUNK_SIZE]
+        population.resources[chunk] -= cost[chunk]
+        population.reproduction_ready_turns[chunk] = 0
+        population.time_since_last_reproduction[chunk] = 0
+    mutation_rate = settings["MUTATION_RATE"]
+    for start in range(0, parents.size, CHUNK_SIZE):
+        chunk = parents[start:start + CHUNK_SIZE]
+        newborn_species = population.species[chunk]
+        mutation = mutation_rng.uniform(-mutation_rate, mutation_rate, chunk.size)
+        efficiency = np.maximum(0.1, population.efficiency[chunk] + mutation) * efficiency_factor[newborn_species]
+        parent_ids = population.id[chunk] if population.lineage else None
+        population.add(newborn_species, efficiency, settings["STARTING_RESOURCES"], population.weight[chunk], population.cell[chunk], parent_ids)
+    if population.weighted:
+        return int(population.weight[-parents.size:].sum())
+    return parents.size
+
+
+def merge_phase(population, threshold, rng):
+    """
+    Стискає популяцію до threshold рядків, об'єднуючи організми у
+    суперорганізми (кілька проходів, якщо рядків більше ніж удвічі).
+
+    Рядки сортуються за видом і ефективністю, і об'єднуються сусідні пари
+    одного виду: вага пари — сума ваг, а всі інші атрибути беруться з одного
+    з двох рядків з імовірністю, пропорційною його вазі. Тож кількість
+    організмів зберігається точно, а розподіли атрибутів — в середньому.
+
+    Returns:
+        int: Кількість об'єднаних пар.
+    """
+    merged = 0
+    while len(population) > threshold:
+        population.permute(np.lexsort((population.efficiency, population.species)))
+        first = np.arange(0, len(population) - 1, 2)
+        first = first[population.species[first] == population.species[first + 1]]
+        if first.size == 0:
+            break
+        excess = len(population) - threshold
+        if first.size > excess:
+            first = np.sort(rng.choice(first, excess, replace=False))
+        second = first + 1
+        weight = population.weight
+        take_second = rng.random(first.size) * (weight[first] + weight[second]) < weight[second]
+        for name in Population.FIELDS:
+            if name != "weight":
+                column = getattr(population, name)
+                column[first[take_second]] = column[second[take_second]]
+        weight[first] += weight[second]
+        keep = np.ones(len(population), dtype=bool)
+        keep[second] = False
+        population.keep(keep)
+        population.weighted = True
+        merged += first.size
+    return merged
+
+
+# Клас для опису виду
+class Species:
+    """
+    Parameters:
+        suffix (str): Суфікс ключів статистики ("_a", "_b" або "" для єдиного виду).
+        count_key (str): Ключ налаштувань з початковою кількістю організмів.
+        reproduction_cost_key (str): Ключ налаштувань з ціною розмноження.
+        reproduction_turns (int): Скільки ітерацій накопичення потрібно для розмноження.
+        efficiency_factor (float): Множник ефективності при народженні
+            (OrganismB зменшує ефективність удвічі).
+    """
+
+    def __init__(self, suffix, count_key, reproduction_cost_key, reproduction_turns=3, efficiency_factor=1.0):
+        self.suffix = suffix
+        self.count_key = count_key
+        self.reproduction_cost_key = reproduction_cost_key
+        self.reproduction_turns = reproduction_turns
+        self.efficiency_factor = efficiency_factor
+
+
+# Клас для опису моделі: види та правила взаємодії
+class Model:
+    """
+    Parameters:
+        species (list[Species]): Види; номер у списку — значення стовпчика species.
+        default_settings (dict): Налаштування за замовчуванням.
+        competition (callable): Правило конкуренції за ресурси.
+        predation (callable): Правило хижацтва.
+        max_age_key (str | None): Ключ налаштувань з максимальним віком (None — без старіння).
+        stop_when_any_extinct (bool): Зупинятися, коли вимер будь-який вид, а не вся популяція.
+        event_keys (tuple[str]): Лічильники подій, які повертає правило хижацтва.
+        name (str): Назва для MODELS (за нею модель знаходиться у контрольних точках).
+    """
+
+    def __init__(self, species, default_settings, competition, predation, max_age_key=None, stop_when_any_extinct=False, event_keys=(), name=None):
+        self.name = name
+        self.species = species
+        self.default_settings = default_settings
+        self.competition = competition
+        self.predation = predation
+        self.max_age_key = max_age_key
+        self.stop_when_any_extinct = stop_when_any_extinct
+        self.event_keys = tuple(event_keys)
+
+    def statistics_keys(self):
+        return [f"population_size{species.suffix}" for species in self.species] + [
+            f"average_efficiency{species.suffix}" for species in self.species
+        ]
+
+    def columns(self):
+        """Усі стовпчики рядка статистики."""
+        return ["iteration", *self.statistics_keys(), "births", "deaths", *self.event_keys]
+
+
+ECO_MODEL = Model(
+    species=[Species("", "NUM_ORGANISMS", "RESOURCE_REPRODUCTION_COST")],
+    default_settings=ECO_SETTINGS,
+    competition=proportional_competition,
+    predation=eco_predation,
+    name="eco",
+)
+
+COMPETE_MODEL = Model(
+    species=[
+        Species("_a", "NUM_ORGANISMS_A", "RESOURCE_REPRODUCTION_COST_A"),
+        Species("_b", "NUM_ORGANISMS_B", "RESOURCE_REPRODUCTION_COST_B", efficiency_factor=0.5),
+    ],
+    default_settings=COMPETE_SETTINGS,
+    competition=claim_competition,
+    predation=compete_predation,
+    event_keys=("kills",),
+    name="compete",
+)
+
+WAR_MODEL = Model(
+    species=[
+        Species("_a", "NUM_ORGANISMS_A", "RESOURCE_REPRODUCTION_COST_A"),
+        Species("_b", "NUM_ORGANISMS_B", "RESOURCE_REPRODUCTION_COST_B", reproduction_turns=7, efficiency_factor=0.5),
+    ],
+    default_settings=WAR_SETTINGS,
+    competition=proportional_competition,
+    predation=war_predation,
+    max_age_key="EXPIRED",
+    stop_when_any_extinct=True,
+    event_keys=("kills", "escapes", "counterattacks"),
+    name="war",
+)
+
+MODELS = {model.name: model for model in (ECO_MODEL, COMPETE_MODEL, WAR_MODEL)}
+
+
+def food_web_model(settings=None, name="food_web"):
+    """
+    Модель з K видами і харчовою мережею FOOD_WEB (food_web_predation).
+
+    Вид i описується ключами налаштувань із суфіксом своєї літери
+    (species_key): NUM_ORGANISMS, RESOURCE_REPRODUCTION_COST,
+    REPRODUCTION_TURNS, EFFICIENCY_FACTOR, PREDATION_THRESHOLD, ESCAPE_CHANCE
+    і COUNTERATTACK_CHANCE_FACTOR; статистика — population_size_<літера> і
+    average_efficiency_<літера>. Кількість видів, REPRODUCTION_TURNS і
+    EFFICIENCY_FACTOR фіксуються при створенні моделі, решта читається на
+    кожній ітерації. Контрольні точки відновлюють таку модель з її
+    налаштувань (find_model), тож реєструвати її в MODELS не потрібно.
+
+    Parameters:
+        settings (dict): Налаштування за замовчуванням (відсутні беруться з FOOD_WEB_SETTINGS).
+        name (str): Назва моделі.
+
+    Returns:
+        Model: Модель, що зупиняється, лише коли вимерли всі види.
+    """
+    settings = {**FOOD_WEB_SETTINGS, **(settings or {})}
+    web = food_web_parameters(settings)[0]
+    species = []
+    for species_id in range(len(web)):
+        species.append(Species(
+            f"_{SPECIES_LETTERS[species_id].lower()}",
+            species_key("NUM_ORGANISMS", species_id),
+            species_key("RESOURCE_REPRODUCTION_COST", species_id),
+            reproduction_turns=settings[species_key("REPRODUCTION_TURNS", species_id)],
+            efficiency_factor=settings[species_key("EFFICIENCY_FACTOR", species_id)],
+        ))
+    model = Model(
+        species=species,
+        default_settings=settings,
+        competition=proportional_competition,
+        predation=food_web_predation,
+        max_age_key="EXPIRED",
+        event_keys=("kills", "escapes", "counterattacks"),
+        name=name,
+    )
+    return model
+
+
+FOOD_WEB_MODEL = food_web_model()
+MODELS[FOOD_WEB_MODEL.name] = FOOD_WEB_MODEL
+
+
+def find_model(name, settings):
+    """Модель з MODELS за назвою; модель з харчовою мережею створюється заново з settings."""
+    if "FOOD_WEB" in settings:
+        return food_web_model(settings, name)
+    return MODELS[name]
+
+
+def _new_grid(settings):
+    if settings["GRID_SIZE"] is None:
+        return None
+    if settings["SUPER_INDIVIDUAL_THRESHOLD"] is not None:
+        raise ValueError("GRID_SIZE не поєднується з SUPER_INDIVIDUAL_THRESHOLD.")
+    return Grid(settings["GRID_SIZE"])
+
+
+def _new_population(capacity, storage, lineage=False):
+    if storage is None:
+        return Population(capacity=capacity, lineage=lineage)
+    return MemmapPopulation(storage, capacity=capacity, lineage=lineage)
+
+
+# Симуляція будь-якої моделі над популяцією-масивами
+class Simulation:
+    """
+    Спільне ядро eco_system, compete_system, war_system, war_system2 і food_web_system.
+
+    Налаштування зчитуються на кожній ітерації, тож їх можна змінювати
+    між викликами step() (як у war_system2).
+
+    Рядок статистики кожної ітерації (стовпчики Model.columns()) передається
+    у sink. За замовчуванням це MemorySink, і статистика доступна як словник
+    списків statistics; зі StreamingSink рядки пишуться у файл, statistics
+    дорівнює None, а останній рядок завжди є в last_row.
+
+    Parameters:
+        model (Model): Види та правила взаємодії.
+        settings (dict): Параметри симуляції (відсутні беруться з model.default_settings).
+        seed (int | np.random.SeedSequence | None): Зерно для RandomStreams.
+        sink (MemorySink | StreamingSink): Куди записувати рядки статистики.
+        instrument (bool): Одразу ввімкнути instrumentation (лічильники подій
+            і таймери фаз); перемикається й пізніше через instrumentation.enabled.
+        storage (str | None): Каталог для MemmapPopulation (популяція поза
+            оперативною пам'яттю); None — звичайна Population.
+        histograms (TraitHistograms | None): Куди записувати розподіли
+            ефективності та ресурсів кожного виду на кожній ітерації.
+        genealogy (Genealogy | None): Куди записувати народження і смерті
+            з id батька (не поєднується з SUPER_INDIVIDUAL_THRESHOLD і не
+            зберігається в контрольній точці).
+    """
+
+    def __init__(self, model, settings=None, seed=None, sink=None, instrument=False, storage=None, histograms=None, genealogy=None):
+        self.model = model
+        self.settings = {**model.default_settings, **(settings or {})}
+        self.streams = RandomStreams(seed)
+        s = self.settings
+
+        self.grid = _new_grid(s)
+        if genealogy is not None and s["SUPER_INDIVIDUAL_THRESHOLD"] is not None:
+            raise ValueError("Генеалогія не поєднується з SUPER_INDIVIDUAL_THRESHOLD.")
+        self.genealogy = genealogy
+        initial_size = sum(s[species.count_key] for species in model.species)
+        self.population = _new_population(max(1024, initial_size), storage, lineage=genealogy is not None)
+        for species_id, species in enumerate(model.species):
+            for start in range(0, s[species.count_key], CHUNK_SIZE):
+                count = min(CHUNK_SIZE, s[species.count_key] - start)
+                efficiency = self.streams.initial.uniform(0.1, 1.0, count) * species.efficiency_factor
+                cell = 0 if self.grid is None else self.grid.place(self.streams.movement, count)
+                ids = None if genealogy is None else genealogy.born(np.full(count, NO_PARENT), 0, species_id, efficiency)
+                self.population.add(species_id, efficiency, s["STARTING_RESOURCES"], cell=cell, ids=ids)
+        if self.grid is None:
+            self.resources = ResourceLedger(s["RESOURCE_EXPIRATION"], s["RESOURCE_GENERATION"] * s["RESOURCE_GENERATION"])
+        else:
+            self.resources = ResourceLedger(s["RESOURCE_EXPIRATION"], self._resources_per_cell(), cells=self.grid.cells)
+        self.sink = sink if sink is not None else MemorySink()
+        self.sink.open(model.columns())
+        self.statistics = getattr(self.sink, "columns", None)
+        self.last_row = None
+        self.instrumentation = Instrumentation(enabled=instrument)
+        self.histograms = histograms
+        self.iteration = 0
+
+    def checkpoint_state(self):
+        """
+        Повний стан симуляції для контрольної точки (без статистики, яку
+        зберігає сам sink).
+
+        Returns:
+            tuple[dict, dict]: Стовпчики популяції та JSON-сумісний стан решти.
+        """
+        arrays = {name: getattr(self.population, name) for name in Population.FIELDS}
+        state = {
+            "model": self.model.name,
+            "settings": self.settings,
+            "iteration": self.iteration,
+            "last_row": self.last_row,
+            "resources": self.resources.state(),
+            "streams": self.streams.state(),
+        }
+        return arrays, state
+
+    @classmethod
+    def from_checkpoint_state(cls, arrays, state, sink, instrument=False, storage=None):
+        """
+        Відновлює симуляцію зі стану checkpoint_state(); продовження дає ті
+        самі результати, що й запуск без перерви.
+
+        Parameters:
+            arrays (dict): Стовпчики популяції.
+            state (dict): Решта стану.
+            sink (MemorySink | StreamingSink): Уже відкритий sink зі статистикою до контрольної точки.
+            instrument (bool): Увімкнути instrumentation.
+            storage (str | None): Каталог для MemmapPopulation.
+        """
+        simulation = cls.__new__(cls)
+        simulation.model = find_model(state["model"], state["settings"])
+        simulation.settings = dict(state["settings"])
+        simulation.grid = _new_grid(simulation.settings)
+        simulation.streams = RandomStreams.from_state(state["streams"])
+        if storage is None:
+            simulation.population = Population.from_arrays(arrays)
+        else:
+            simulation.population = MemmapPopulation.from_arrays(arrays, directory=storage)
+        simulation.resources = ResourceLedger.from_state(state["resources"])
+        simulation.sink = sink
+        simulation.statistics = getattr(sink, "columns", None)
+        simulation.last_row = state["last_row"]
+        simulation.instrumentation = Instrumentation(enabled=instrument)
+        simulation.histograms = None
+        simulation.genealogy = None
+        simulation.iteration = state["iteration"]
+        return simulation
+
+    def _resources_per_cell(self):
+        s = self.settings
+        return s["RESOURCE_GENERATION"] * s["RESOURCE_GENERATION"] / self.grid.cells
+
+    def _generate_resources(self):
+        s = self.settings
+        if self.grid is not None:
+            self.resources.add(self._resources_per_cell())
+            self.resources.age_one_turn()
+            return self.resources.total.copy()
+        self.resources.add(s["RESOURCE_GENERATION"] * s["RESOURCE_GENERATION"])
+        self.resources.age_one_turn()
+        return float(self.resources.total)
+
+    def _compete(self, total_available_resources):
+        population = self.population
+        if self.grid is None:
+            self.model.competition(population, total_available_resources, self.settings)
+            return
+        # На ґратці спожиті ресурси забираються з клітинок
+        gained = population.resources.copy()
+        self.model.competition(population, total_available_resources, self.settings, self.grid)
+        np.subtract(population.resources, gained, out=gained)
+        self.resources.consume(self.grid.consumed(population, gained))
+
+    def _reproduce(self):
+        species = self.model.species
+        return reproduction_phase(
+            self.population,
+            self.settings,
+            self.streams.mutation,
+            np.array([self.settings[sp.reproduction_cost_key] for sp in species], dtype=np.float64),
+            np.array([sp.reproduction_turns for sp in species], dtype=np.int32),
+            np.array([sp.efficiency_factor for sp in species]),
+        )
+
+    def _record_births(self, births):
+        # Нащадки — останні births рядків, і їхній id поки що дорівнює id батька
+        newborn = slice(len(self.population) - births, len(self.population))
+        population = self.population
+        population.id[newborn] = self.genealogy.born(
+            population.id[newborn].copy(), self.iteration, population.species[newborn], population.efficiency[newborn]
+        )
+        self.genealogy.maybe_prune()
+
+    def _collect_statistics(self, births, deaths, events):
+        population = self.population
+        num_species = len(self.model.species)
+        species = population.species_index()
+        if population.weighted:
+            weight = population.scratch("statistics_weight", np.float64)
+            np.copyto(weight, population.weight)
+            counts = np.bincount(species, weights=weight, minlength=num_species).astype(np.int64)
+            np.multiply(weight, population.efficiency, out=weight)
+            sums = np.bincount(species, weights=weight, minlength=num_species)
+        else:
+            counts = np.bincount(species, minlength=num_species)
+            sums = np.bincount(species, weights=population.efficiency, minlength=num_species)
+        means = np.divide(sums, counts, out=np.zeros(num_species), where=counts > 0)
+        row = {"iteration": self.iteration, "births": int(births), "deaths": int(deaths)}
+        for species_id, species in enumerate(self.model.species):
+            row[f"population_size{species.suffix}"] = int(counts[species_id])
+            row[f"average_efficiency{species.suffix}"] = float(means[species_id])
+        for key in self.model.event_keys:
+            row[key] = int((events or {}).get(key, 0))
+        self.sink.write(row)
+        self.last_row = row
+        return counts
+
+    def step(self):
+        """
+        Виконує одну ітерацію симуляції.
+
+        Returns:
+            str | None: "extinct", якщо популяція (або, для war, одна з груп)
+            вимерла, "explosion", якщо популяція перевищила POPULATION_LIMIT
+            (лише без SUPER_INDIVIDUAL_THRESHOLD), інакше None.
+        """
+        s = self.settings
+        model = self.model
+        population = self.population
+        probe = self.instrumentation if self.instrumentation.enabled else None
+        if probe:
+            probe.begin(self.iteration)
+        total_available_resources = self._generate_resources()
+        if probe:
+            probe.lap("resources")
+
+        if self.grid is None:
+            population.shuffle(self.streams.shuffle)
+        else:
+            self.grid.arrange(population, self.streams.movement, self.streams.shuffle)
+        if probe:
+            probe.lap("shuffle")
+        self._compete(total_available_resources)
+        if probe:
+            probe.lap("competition")
+
+        alive = population.scratch("alive", bool)
+        alive.fill(True)
+        # Хижацтво суперорганізмів зменшує ваги на місці, тож розмір береться до нього
+        size_before_deaths = population.total()
+        events = model.predation(population, s, self.streams, alive, self.grid)
+        if probe:
+            probe.lap("predation")
+
+        survive_phase(population, s["RESOURCE_COST"])
+        if probe:
+            probe.lap("survival")
+            survivors = population.total(alive)
+        condition = population.scratch("condition", bool)
+        np.less(population.no_resources_turns, 2, out=condition)
+        np.logical_and(alive, condition, out=alive)
+        if probe:
+            starved = survivors - population.total(alive)
+        if model.max_age_key is not None:
+            np.less_equal(population.age, s[model.max_age_key], out=condition)
+            np.logical_and(alive, condition, out=alive)
+        if self.genealogy is not None:
+            self.genealogy.died(population.id[np.logical_not(alive)], self.iteration)
+        population.keep(alive)
+        deaths = size_before_deaths - population.total()
+        if probe:
+            events = events or {}
+            probe.count("deaths_starvation", starved)
+            probe.count("deaths_old_age", deaths - (size_before_deaths - survivors) - starved)
+            probe.count("deaths_predation", events.get("kills", 0))
+            probe.count("deaths_counterattack", events.get("counterattacks", 0))
+            probe.count("escapes", events.get("escapes", 0))
+            probe.lap("deaths")
+
+        births = self._reproduce()
+        if self.genealogy is not None and births:
+            self._record_births(births)
+        if probe:
+            probe.count("births", births)
+            probe.lap("reproduction")
+
+        threshold = s["SUPER_INDIVIDUAL_THRESHOLD"]
+        if threshold is not None and len(population) > threshold:
+            merge_phase(population, threshold, self.streams.merge)
+        if probe:
+            probe.lap("merge")
+
+        counts = self._collect_statistics(births, deaths, events)
+        if self.histograms is not None:
+            self.histograms.record(self.iteration, population, len(model.species))
+        if probe:
+            probe.lap("statistics")
+            probe.end()
+        self.iteration += 1
+        if counts.sum() == 0 or (model.stop_when_any_extinct and counts.min() == 0):
+            return "extinct"
+        limit = s["POPULATION_LIMIT"]
+        if limit is not None and threshold is None and counts.max() > limit:
+            return "explosion"
+        return None
+
+    def run(self, num_iterations=None):
+        """Виконує симуляцію до NUM_ITERATIONS ітерацій або до вимирання / вибуху."""
+        if num_iterations is None:
+            num_iterations = self.settings["NUM_ITERATIONS"]
+        for _ in range(num_iterations):
+            status = self.step()
+            if status is not None:
+                return status
+        return None
+
+    def close(self):
+        """Дописує залишок статистики у sink (для StreamingSink — на диск)."""
+        self.sink.close()
+
+
+class EcoSimulation(Simulation):
+    def __init__(self, settings=None, seed=None, sink=None, instrument=False, storage=None, histograms=None, genealogy=None):
+        super().__init__(ECO_MODEL, settings, seed, sink, instrument, storage, histograms, genealogy)
+
+
+class CompeteSimulation(Simulation):
+    def __init__(self, settings=None, seed=None, sink=None, instrument=False, storage=None, histograms=None, genealogy=None):
+        super().__init__(COMPETE_MODEL, settings, seed, sink, instrument, storage, histograms, genealogy)
+
+
+class WarSimulation(Simulation):
+    def __init__(self, settings=None, seed=None, sink=None, instrument=False, storage=None, histograms=None, genealogy=None):
+        super().__init__(WAR_MODEL, settings, seed, sink, instrument, storage, histograms, genealogy)
+
+
+class FoodWebSimulation(Simulation):
+    # Модель будується з налаштувань: кількість видів задає FOOD_WEB, а
+    # REPRODUCTION_TURNS_* і EFFICIENCY_FACTOR_* фіксуються у видах моделі
+    def __init__(self, settings=None, seed=None, sink=None, instrument=False, storage=None, histograms=None, genealogy=None):
+        super().__init__(food_web_model(settings), settings, seed, sink, instrument, storage, histograms, genealogy)
@@ -0,0 +1,129 @@
+from engine import SPECIES_LETTERS, FoodWebSimulation
+
+# Налаштування симуляції: FOOD_WEB[i][j] = 1, якщо вид i полює на вид j.
+# A — рослиноїдні, B полюють на A, C — верхівкові хижаки, що полюють на A і B.
+# Для іншої кількості видів задайте матрицю K x K і ключі з суфіксами _A, _B, ...
+FOOD_WEB = [
+    [0, 0, 0],
+    [1, 0, 0],
+    [1, 1, 0],
+]
+NUM_ORGANISMS_A = 100  # Початкова кількість організмів виду A
+NUM_ORGANISMS_B = 60  # Початкова кількість організмів виду B
+NUM_ORGANISMS_C = 20  # Початкова кількість організмів виду C
+NUM_ITERATIONS = 50  # Кількість ітерацій
+RESOURCE_GENERATION = 20  # Ресурси, що додаються кожної ітерації (у квадраті)
+RESOURCE_COST = 10  # Мінімальна кількість ресурсів для виживання
+RESOURCE_REPRODUCTION_COST_A = 21  # Ресурси для розмноження виду A
+RESOURCE_REPRODUCTION_COST_B = 60  # Ресурси для розмноження виду B
+RESOURCE_REPRODUCTION_COST_C = 90  # Ресурси для розмноження виду C
+REPRODUCTION_TURNS_A = 3  # Ітерацій накопичення ресурсів для розмноження виду A
+REPRODUCTION_TURNS_B = 7  # Ітерацій накопичення ресурсів для розмноження виду B
+REPRODUCTION_TURNS_C = 9  # Ітерацій накопичення ресурсів для розмноження виду C
+EFFICIENCY_FACTOR_A = 1.0  # Множник ефективності нащадків виду A
+EFFICIENCY_FACTOR_B = 0.5  # Множник ефективності нащадків виду B
+EFFICIENCY_FACTOR_C = 0.5  # Множник ефективності нащадків виду C
+PREDATION_THRESHOLD_A = 4  # Ітерацій без розмноження до хижацтва виду A (якщо має жертв)
+PREDATION_THRESHOLD_B = 4  # Ітерацій без розмноження до хижацтва виду B
+PREDATION_THRESHOLD_C = 3  # Ітерацій без розмноження до хижацтва виду C
+ESCAPE_CHANCE_A = 0.3  # Шанс втечі жертви виду A
+ESCAPE_CHANCE_B = 0.4  # Шанс втечі жертви виду B
+ESCAPE_CHANCE_C = 0.5  # Шанс втечі жертви виду C
+COUNTERATTACK_CHANCE_FACTOR_A = 0.1  # Фактор контратаки жертви виду A
+COUNTERATTACK_CHANCE_FACTOR_B = 0.2  # Фактор контратаки жертви виду B
+COUNTERATTACK_CHANCE_FACTOR_C = 0.3  # Фактор контратаки жертви виду C
+RESOURCE_EXPIRATION = 3  # Термін придатності ресурсів (у ітераціях)
+EXPIRED = 8  # Максимальний вік організму
+MUTATION_RATE = 0.1  # Ймовірність мутації
+STARTING_RESOURCES = 160  # Початковий запас ресурсів у кожного організму
+
+SETTINGS = {
+    "FOOD_WEB": FOOD_WEB,
+    "NUM_ORGANISMS_A": NUM_ORGANISMS_A,
+    "NUM_ORGANISMS_B": NUM_ORGANISMS_B,
+    "NUM_ORGANISMS_C": NUM_ORGANISMS_C,
+    "NUM_ITERATIONS": NUM_ITERATIONS,
+    "RESOURCE_GENERATION": RESOURCE_GENERATION,
+    "RESOURCE_COST": RESOURCE_COST,
+    "RESOURCE_REPRODUCTION_COST_A": RESOURCE_REPRODUCTION_COST_A,
+    "RESOURCE_REPRODUCTION_COST_B": RESOURCE_REPRODUCTION_COST_B,
+    "RESOURCE_REPRODUCTION_COST_C": RESOURCE_REPRODUCTION_COST_C,
+    "REPRODUCTION_TURNS_A": REPRODUCTION_TURNS_A,
+    "REPRODUCTION_TURNS_B": REPRODUCTION_TURNS_B,
+    "REPRODUCTION_TURNS_C": REPRODUCTION_TURNS_C,
+    "EFFICIENCY_FACTOR_A": EFFICIENCY_FACTOR_A,
+    "EFFICIENCY_FACTOR_B": EFFICIENCY_FACTOR_B,
+    "EFFICIENCY_FACTOR_C": EFFICIENCY_FACTOR_C,
+    "PREDATION_THRESHOLD_A": PREDATION_THRESHOLD_A,
+    "PREDATION_THRESHOLD_B": PREDATION_THRESHOLD_B,
+    "PREDATION_THRESHOLD_C": PREDATION_THRESHOLD_C,
+    "ESCAPE_CHANCE_A": ESCAPE_CHANCE_A,
+    "ESCAPE_CHANCE_B": ESCAPE_CHANCE_B,
+    "ESCAPE_CHANCE_C": ESCAPE_CHANCE_C,
+    "COUNTERATTACK_CHANCE_FACTOR_A": COUNTERATTACK_CHANCE_FACTOR_A,
+    "COUNTERATTACK_CHANCE_FACTOR_B": COUNTERATTACK_CHANCE_FACTOR_B,
+    "COUNTERATTACK_CHANCE_FACTOR_C": COUNTERATTACK_CHANCE_FACTOR_C,
+    "RESOURCE_EXPIRATION": RESOURCE_EXPIRATION,
+    "EXPIRED": EXPIRED,
+    "MUTATION_RATE": MUTATION_RATE,
+    "STARTING_RESOURCES": STARTING_RESOURCES,
+}
+
+
+def run(settings=None, seed=None, show=False):
+    """
+    Запускає симуляцію з харчовою мережею (спільне ядро engine.py) у поточному процесі.
+
+    FoodWebSimulation створює модель з налаштувань, тож кількість видів
+    визначає FOOD_WEB.
+
+    Parameters:
+        settings (dict): Параметри симуляції; відсутні беруться з SETTINGS.
+        seed (int | None): Зерно генератора випадкових чисел.
+        show (bool): Показати графіки після завершення (matplotlib імпортується лише тоді).
+
+    Returns:
+        dict: Статистика симуляції за ітераціями.
+    """
+    settings = {**SETTINGS, **(settings or {})}
+    simulation = FoodWebSimulation(settings, seed=seed)
+    status = simulation.run()
+    if status == "extinct":
+        print(f"Усі види вимерли на {simulation.iteration - 1}-й ітерації.")
+    elif status == "explosion":
+        print(f"Популяцію зупинено на {simulation.iteration - 1}-й ітерації через перевищення POPULATION_LIMIT.")
+    if show:
+        plot_statistics(simulation.statistics, len(settings["FOOD_WEB"]))
+    return simulation.statistics
+
+
+def plot_statistics(statistics, num_species):
+    import matplotlib.pyplot as plt
+
+    plt.figure(figsize=(12, 6))
+    letters = SPECIES_LETTERS[:num_species]
+
+    # Розмір популяції кожного виду
+    plt.subplot(1, 2, 1)
+    for letter in letters:
+        plt.plot(statistics["iteration"], statistics[f"population_size_{letter.lower()}"], label=f"Population {letter}")
+    plt.xlabel("Iteration")
+    plt.ylabel("Population Size")
+    plt.title("Population Size Over Time")
+    plt.legend()
+
+    # Середня ефективність кожного виду
+    plt.subplot(1, 2, 2)
+    for letter in letters:
+        plt.plot(statistics["iteration"], statistics[f"average_efficiency_{letter.lower()}"], label=f"Efficiency {letter}")
+    plt.xlabel("Iteration")
+    plt.ylabel("Average Efficiency")
+    plt.title("Average Efficiency Over Time")
+    plt.legend()
+
+    plt.tight_layout()
+    plt.show()
+
+
+if __name__ == "__main__":
+    run(show=True)
@@ -1,6 +1,7 @@
 import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.widgets import Button, TextBox
+from live_plot import IncrementalLines
 
 # Функція для одного кроку реплікаторної динаміки
 def step_replicator_dynamics(payoff_matrix, population):
@@ -18,48 +19,25 @@ payoff_matrix = np.array([
 # Початкові параметри
 population = np.array([0.7, 0.3])  # 50% голубів, 50% яструбів
 time_step = 0
-populations_over_time = [population]
 
 # Функція для оновлення графіка
 def update_graph(event):
-    global population, time_step, populations_over_time
+    global population, time_step
     population = step_replicator_dynamics(payoff_matrix, population)
-    populations_over_time.append(population)
     time_step += 1
-
-    # Оновлюємо графік
-    ax.clear()
-    ax.plot(range(time_step + 1), [p[0] for p in populations_over_time], label="Голуби")
-    ax.plot(range(time_step + 1), [p[1] for p in populations_over_time], label="Яструби")
-    ax.set_title("Еволюція популяції (Яструби і Голуби)")
-    ax.set_xlabel("Крок часу")
-    ax.set_ylabel("Частка в популяції")
-    ax.legend()
-    ax.grid()
-    plt.draw()
+    history.append(time_step, population)  # Домальовуємо лише новий крок
 
 # Функція для оновлення популяції вручну
 def manual_update(event):
-    global population, populations_over_time, time_step
+    global population, time_step
     try:
         dove = float(textbox_dove.text)
         hawk = float(textbox_hawk.text)
         if dove + hawk != 1.0:
             raise ValueError("Сума має бути рівною 1.")
         population = np.array([dove, hawk])
-        populations_over_time.append(population)
         time_step += 1
-        
-        # Оновлення графіка
-        ax.clear()
-        ax.plot(range(time_step + 1), [p[0] for p in populations_over_time], label="Голуби")
-        ax.plot(range(time_step + 1), [p[1] for p in populations_over_time], label="Яструби")
-        ax.set_title("Еволюція популяції (Яструби і Голуби)")
-        ax.set_xlabel("Крок часу")
-        ax.set_ylabel("Частка в популяції")
-        ax.legend()
-        ax.grid()
-        plt.draw()
+        history.append(time_step, population)
     except ValueError as e:
         print(f"Помилка: {e}")
 
@@ -85,8 +63,7 @@ ax_textbox_hawk = plt.axes([0.55, 0.18, 0.3, 0.05])
 textbox_hawk = TextBox(ax_textbox_hawk, "Яструби:", initial="0.5")
 
 # Ініціалізація графіка
-ax.plot([0], [population[0]], label="Голуби")
-ax.plot([0], [population[1]], label="Яструби")
+history = IncrementalLines(ax, ["Голуби", "Яструби"], population)
 ax.set_title("Еволюція популяції (Яструби і Голуби)")
 ax.set_xlabel("Крок часу")
 ax.set_ylabel("Частка в популяції")
@@ -1,6 +1,7 @@
 import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.widgets import Button, TextBox
+from live_plot import IncrementalLines
 
 # Функція для одного кроку реплікаторної динаміки
 def step_replicator_dynamics(payoff_matrix, population):
@@ -22,29 +23,17 @@ payoff_matrix = np.array([
 # Початкові параметри
 population = np.array([0.5, 0.5])  # 50% Олень, 50% Кролик
 time_step = 0
-populations_over_time = [population]
 
 # Функція для оновлення графіка
 def update_graph(event):
-    global population, time_step, populations_over_time
+    global population, time_step
     population = step_replicator_dynamics(payoff_matrix, population)
-    populations_over_time.append(population)
     time_step += 1
-
-    # Оновлюємо графік
-    ax.clear()
-    ax.plot(range(time_step + 1), [p[0] for p in populations_over_time], label="Олень")
-    ax.plot(range(time_step + 1), [p[1] for p in populations_over_time], label="Кролик")
-    ax.set_title("Еволюція популяції (Полювання на оленя)")
-    ax.set_xlabel("Крок часу")
-    ax.set_ylabel("Частка в популяції")
-    ax.legend()
-    ax.grid()
-    plt.draw()
+    history.append(time_step, population)  # Домальовуємо лише новий крок
 
 # Функція для ручного оновлення популяції
 def manual_update(event):
-    global population, populations_over_time, time_step
+    global population, time_step
     try:
         stag = float(textbox_stag.text)
         hare = float(textbox_hare.text)
@@ -55,19 +44,8 @@ def manual_update(event):
             raise ValueError("Частки не можуть бути від’ємними.")
         
         population = np.array([stag, hare])
-        populations_over_time.append(population)
         time_step += 1
-
-        # Оновлення графіка
-        ax.clear()
-        ax.plot(range(time_step + 1), [p[0] for p in populations_over_time], label="Олень")
-        ax.plot(range(time_step + 1), [p[1] for p in populations_over_time], label="Кролик")
-        ax.set_title("Еволюція популяції (Полювання на оленя)")
-        ax.set_xlabel("Крок часу")
-        ax.set_ylabel("Частка в популяції")
-        ax.legend()
-        ax.grid()
-        plt.draw()
+        history.append(time_step, population)
     except ValueError as e:
         print(f"Помилка: {e}")
 
@@ -93,8 +71,7 @@ ax_textbox_hare = plt.axes([0.6, 0.3, 0.3, 0.05])
 textbox_hare = TextBox(ax_textbox_hare, "Кролик:", initial="0.5")
 
 # Ініціалізація графіка
-ax.plot([0], [population[0]], label="Олень")
-ax.plot([0], [population[1]], label="Кролик")
+history = IncrementalLines(ax, ["Олень", "Кролик"], population)
 ax.set_title("Еволюція популяції (Полювання на оленя)")
 ax.set_xlabel("Крок часу")
 ax.set_ylabel("Частка в популяції")
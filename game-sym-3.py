@@ -1,5 +1,6 @@
 import numpy as np
 import matplotlib.pyplot as plt
+from replicator import replicator_dynamics_batch
 
 def replicator_dynamics(payoff_matrix, initial_population, time_steps):
     """
@@ -13,17 +14,7 @@ def replicator_dynamics(payoff_matrix, initial_population, time_steps):
     Returns:
         populations (np.ndarray): Масив часток стратегій у часі.
     """
-    population = np.array(initial_population)
-    populations = [population]
-    
-    for _ in range(time_steps):
-        fitness = payoff_matrix @ population  # Фітнес для кожної стратегії
-        average_fitness = population @ fitness  # Середній фітнес у популяції
-        population = population * fitness / average_fitness  # Реплікаторна динаміка
-        population = population / population.sum()  # Нормалізація (сумарна частка = 1)
-        populations.append(population)
-    
-    return np.array(populations)
+    return replicator_dynamics_batch(payoff_matrix, [initial_population], time_steps)[:, 0]
 
 # Налаштування гри "Полювання на оленя"
 payoff_matrix = np.array([
@@ -1,6 +1,7 @@
 import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.widgets import Button, TextBox
+from live_plot import IncrementalLines
 
 # Функція для одного кроку реплікаторної динаміки
 def step_replicator_dynamics(payoff_matrix, population):
@@ -23,30 +24,17 @@ payoff_matrix = np.array([
 # Початкові параметри
 population = np.array([0.33, 0.33, 0.33])  # Частка каменю, ножиць, паперу
 time_step = 0
-populations_over_time = [population]
 
 # Функція для оновлення графіка
 def update_graph(event):
-    global population, time_step, populations_over_time
+    global population, time_step
     population = step_replicator_dynamics(payoff_matrix, population)
-    populations_over_time.append(population)
     time_step += 1
-
-    # Оновлюємо графік
-    ax.clear()
-    ax.plot(range(time_step + 1), [p[0] for p in populations_over_time], label="Камінь")
-    ax.plot(range(time_step + 1), [p[1] for p in populations_over_time], label="Ножиці")
-    ax.plot(range(time_step + 1), [p[2] for p in populations_over_time], label="Папір")
-    ax.set_title("Еволюція популяції (Камінь, ножиці, папір)")
-    ax.set_xlabel("Крок часу")
-    ax.set_ylabel("Частка в популяції")
-    ax.legend()
-    ax.grid()
-    plt.draw()
+    history.append(time_step, population)  # Домальовуємо лише новий крок
 
 # Функція для ручного оновлення популяції
 def manual_update(event):
-    global population, populations_over_time, time_step
+    global population, time_step
     try:
         rock = float(textbox_rock.text)
         scissors = float(textbox_scissors.text)
@@ -54,20 +42,8 @@ def manual_update(event):
         if not np.isclose(rock + scissors + paper, 1.0):
             raise ValueError("Сума має бути рівною 1.")
         population = np.array([rock, scissors, paper])
-        populations_over_time.append(population)
         time_step += 1
-
-        # Оновлення графіка
-        ax.clear()
-        ax.plot(range(time_step + 1), [p[0] for p in populations_over_time], label="Камінь")
-        ax.plot(range(time_step + 1), [p[1] for p in populations_over_time], label="Ножиці")
-        ax.plot(range(time_step + 1), [p[2] for p in populations_over_time], label="Папір")
-        ax.set_title("Еволюція популяції (Камінь, ножиці, папір)")
-        ax.set_xlabel("Крок часу")
-        ax.set_ylabel("Частка в популяції")
-        ax.legend()
-        ax.grid()
-        plt.draw()
+        history.append(time_step, population)
     except ValueError as e:
         print(f"Помилка: {e}")
 
@@ -96,9 +72,7 @@ ax_textbox_paper = plt.axes([0.7, 0.3, 0.2, 0.05])
 textbox_paper = TextBox(ax_textbox_paper, "Папір:", initial="0.34")
 
 # Ініціалізація графіка
-ax.plot([0], [population[0]], label="Камінь")
-ax.plot([0], [population[1]], label="Ножиці")
-ax.plot([0], [population[2]], label="Папір")
+history = IncrementalLines(ax, ["Камінь", "Ножиці", "Папір"], population)
 ax.set_title("Еволюція популяції (Камінь, ножиці, папір)")
 ax.set_xlabel("Крок часу")
 ax.set_ylabel("Частка в популяції")
@@ -0,0 +1,209 @@
+import os
+
+import numpy as np
+
+# Ітерація смерті організму, який ще живий
+ALIVE = -1
+# Батько організму початкової популяції
+NO_PARENT = -1
+
+
+# Родовід організмів у масивах лише для дописування
+class Genealogy:
+    """
+    Родовід: для кожного організму — id, id батька, вид, ефективність при
+    народженні, ітерації народження і смерті. Записи лише дописуються в
+    кінець типізованих масивів, що ростуть подвоєнням ємності, а id
+    зростають, тож масиви завжди впорядковані за id і запис шукається
+    бінарним пошуком (searchsorted).
+
+    Щоб пам'ять не росла з кількістю народжень, prune() видаляє мертві
+    гілки: записи мертвих організмів без живих нащадків. Залишаються живі
+    організми та їхні предки, тобто дерево, з якого походить поточна
+    популяція. Обрізання запускається автоматично, коли записів стало в
+    prune_factor разів більше, ніж після попереднього обрізання.
+
+    Parameters:
+        prune_factor (float): Коефіцієнт росту між автоматичними обрізаннями.
+        capacity (int): Початкова кількість записів.
+    """
+
+    FIELDS = {
+        "id": np.int64,
+        "parent": np.int64,
+        "species": np.int8,
+        "efficiency": np.float64,
+        "birth": np.int32,
+        "death": np.int32,
+    }
+
+    def __init__(self, prune_factor=2.0, capacity=1024):
+        self.prune_factor = prune_factor
+        self.size = 0
+        self.next_id = 0
+        self.pruned_size = 0  # Кількість записів після останнього обрізання
+        self.last_iteration = 0
+        self._buffers = {name: np.zeros(capacity, dtype) for name, dtype in self.FIELDS.items()}
+        self._refresh_views()
+
+    def __len__(self):
+        return self.size
+
+    def _refresh_views(self):
+        for name, buffer in self._buffers.items():
+            setattr(self, name, buffer[:self.size])
+
+    def _reserve(self, capacity):
+        current = len(self._buffers["id"])
+        if capacity <= current:
+            return
+        new_capacity = max(capacity, 2 * current)
+        for name, buffer in self._buffers.items():
+            grown = np.zeros(new_capacity, buffer.dtype)
+            grown[:self.size] = buffer[:self.size]
+            self._buffers[name] = grown
+
+    def _rows(self, ids):
+        """Номери записів для ids; KeyError, якщо організму немає в родоводі (або його видалив prune())."""
+        rows = np.minimum(np.searchsorted(self.id, ids), max(self.size - 1, 0))
+        found = self.id[rows] == ids if self.size else np.zeros(np.shape(ids), dtype=bool)
+        if not np.all(found):
+            missing = np.asarray(ids)[np.logical_not(found)] if np.ndim(ids) else ids
+            raise KeyError(f"Організмів немає в родоводі: {np.ravel(missing)[:10].tolist()}")
+        return rows
+
+    def born(self, parents, iteration, species, efficiency):
+        """
+        Записує нових організмів.
+
+        Parameters:
+            parents (np.ndarray): id батьків (NO_PARENT для початкової популяції).
+            iteration (int): Ітерація народження.
+            species (int | np.ndarray): Вид.
+            efficiency (np.ndarray): Ефективність при народженні.
+
+        Returns:
+            np.ndarray: id нових організмів.
+        """
+        count = len(parents)
+        start, end = self.size, self.size + count
+        self._reserve(end)
+        ids = np.arange(self.next_id, self.next_id + count, dtype=np.int64)
+        self._buffers["id"][start:end] = ids
+        self._buffers["parent"][start:end] = parents
+        self._buffers["species"][start:end] = species
+        self._buffers["efficiency"][start:end] = efficiency
+        self._buffers["birth"][start:end] = iteration
+        self._buffers["death"][start:end] = ALIVE
+        self.next_id += count
+        self.size = end
+        self.last_iteration = max(self.last_iteration, iteration)
+        self._refresh_views()
+        return ids
+
+    def died(self, ids, iteration):
+        """Позначає смерть організмів ids на ітерації iteration."""
+        self.death[self._rows(ids)] = iteration
+        self.last_iteration = max(self.last_iteration, iteration)
+
+    def maybe_prune(self):
+        """Обрізає родовід, якщо записів стало в prune_factor разів більше, ніж після попереднього обрізання."""
+        if self.size > self.prune_factor * max(self.pruned_size, 1024):
+            self.prune()
+
+    def prune(self):
+        """
+        Видаляє записи мертвих організмів без живих нащадків.
+
+        Предки позначаються поколіннями від живих організмів угору (кожен
+        крок — векторизований пошук батьків лише для щойно позначених), тож
+        робота пропорційна кількості записів, що залишаються.
+
+        Returns:
+            int: Кількість видалених записів.
+        """
+        keep = self.death == ALIVE
+        frontier = np.flatnonzero(keep)
+        while frontier.size:
+            parents = self.parent[frontier]
+            rows = np.unique(self._rows(parents[parents != NO_PARENT]))
+            frontier = rows[~keep[rows]]
+            keep[frontier] = True
+        removed = self.size - int(np.count_nonzero(keep))
+        kept = np.flatnonzero(keep)
+        for name, buffer in self._buffers.items():
+            buffer[:len(kept)] = buffer[kept]
+        self.size = len(kept)
+        self.pruned_size = self.size
+        self._refresh_views()
+        return removed
+
+    def living(self, species=None):
+        """id живих організмів (лише виду species, якщо його задано)."""
+        alive = self.death == ALIVE
+        if species is not None:
+            alive &= self.species == species
+        return self.id[alive]
+
+    def ancestors(self, organism_id):
+        """id предків організму від батька до засновника."""
+        result = []
+        parent = self.parent[self._rows(organism_id)]
+        while parent != NO_PARENT:
+            result.append(int(parent))
+            parent = self.parent[self._rows(parent)]
+        return result
+
+    def mrca(self, ids=None):
+        """
+        Найближчий спільний предок організмів ids (за замовчуванням — усіх живих).
+
+        Предок має менший id, ніж нащадок, тож на кожному кроці всі
+        організми, чий id більший за найменший, замінюються своїми батьками,
+        доки не залишиться один.
+
+        Returns:
+            int | None: id спільного предка (ним може бути один з ids) або
+            None, якщо організми походять від різних засновників.
+        """
+        current = np.unique(self.living() if ids is None else np.asarray(ids, dtype=np.int64))
+        if current.size == 0:
+            return None
+        while current.size > 1:
+            lowest = current[0]
+            younger = current[1:]
+            parents = self.parent[self._rows(younger)]
+            if np.any(parents == NO_PARENT):
+                return None  # Засновник не може мати предка серед інших
+            current = np.unique(np.concatenate(([lowest], parents)))
+        return int(current[0])
+
+    def founder_lineages(self):
+        """Кількість засновників (початкових організмів), що мають живих нащадків."""
+        self.prune()
+        return int(np.count_nonzero(self.parent == NO_PARENT))
+
+    def lineages_through_time(self):
+        """
+        Кількість ліній, що дожили до поточної ітерації, на кожній ітерації:
+        скільки організмів, живих наприкінці ітерації t, мають живих
+        нащадків зараз (або живі самі). Виконує prune().
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: (ітерації, кількість ліній).
+        """
+        self.prune()
+        length = self.last_iteration + 1
+        born = np.bincount(self.birth, minlength=length)
+        dead = np.bincount(self.death[self.death != ALIVE], minlength=length)
+        return np.arange(length), np.cumsum(born) - np.cumsum(dead)
+
+    def table(self):
+        """Записи родоводу як словник стовпчиків (копії)."""
+        return {name: getattr(self, name).copy() for name in self.FIELDS}
+
+    def save(self, path):
+        """Зберігає table() у файл .npz (через тимчасовий файл)."""
+        tmp_path = path + ".tmp.npz"
+        np.savez_compressed(tmp_path, **self.table())
+        os.replace(tmp_path, path)
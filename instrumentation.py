@@ -0,0 +1,102 @@
+import time
+
+import numpy as np
+
+
+# Лічильники подій і таймери фаз симуляції
+class Instrumentation:
+    """
+    Лічильники подій і час фаз для кожної інструментованої ітерації.
+
+    Дані зберігаються в масивах NumPy (рядок на ітерацію), що ростуть
+    подвоєнням ємності. Вмикається та вимикається під час запуску через
+    атрибут enabled; вимкнена інструментація не додає роботи на ітерацію,
+    а ввімкнена — лише кілька викликів perf_counter і підрахунків по масках.
+
+    Parameters:
+        enabled (bool): Чи збирати дані з наступної ітерації.
+        capacity (int): Початкова кількість рядків.
+    """
+
+    COUNTERS = (
+        "births",
+        "deaths_starvation",  # Дві ітерації без ресурсів (is_dead)
+        "deaths_old_age",  # Перевищено EXPIRED (is_expired)
+        "deaths_predation",  # Жертви, яких убили хижаки
+        "deaths_counterattack",  # Хижаки, що загинули від контратаки
+        "escapes",  # Напади, під час яких жертва втекла
+    )
+    PHASES = ("resources", "shuffle", "competition", "predation", "survival", "deaths", "reproduction", "merge", "statistics")
+
+    def __init__(self, enabled=False, capacity=1024):
+        self.enabled = enabled
+        self._counter_index = {name: i for i, name in enumerate(self.COUNTERS)}
+        self._phase_index = {name: i for i, name in enumerate(self.PHASES)}
+        self._allocate(capacity)
+
+    def _allocate(self, capacity):
+        self.size = 0
+        self.iterations = np.empty(capacity, dtype=np.int64)
+        self.counters = np.zeros((capacity, len(self.COUNTERS)), dtype=np.int64)
+        self.timings = np.zeros((capacity, len(self.PHASES)))
+        self._last = 0.0
+
+    def _reserve(self, capacity):
+        if capacity <= len(self.iterations):
+            return
+        new_capacity = max(capacity, 2 * len(self.iterations))
+        for name in ("iterations", "counters", "timings"):
+            old = getattr(self, name)
+            grown = np.zeros((new_capacity, *old.shape[1:]), dtype=old.dtype)
+            grown[:self.size] = old[:self.size]
+            setattr(self, name, grown)
+
+    def reset(self):
+        """Видаляє всі зібрані рядки."""
+        self._allocate(len(self.iterations))
+
+    def begin(self, iteration):
+        """Починає рядок для ітерації і запускає таймер."""
+        self._reserve(self.size + 1)
+        self.iterations[self.size] = iteration
+        self.counters[self.size] = 0
+        self.timings[self.size] = 0
+        self._last = time.perf_counter()
+
+    def lap(self, phase):
+        """Зараховує час від попереднього виклику до фази phase."""
+        now = time.perf_counter()
+        self.timings[self.size, self._phase_index[phase]] += now - self._last
+        self._last = now
+
+    def count(self, name, value):
+        self.counters[self.size, self._counter_index[name]] += value
+
+    def end(self):
+        self.size += 1
+
+    def table(self):
+        """
+        Returns:
+            dict: "iteration", лічильники COUNTERS і час фаз "time_<фаза>" (секунди)
+            як масиви по одному значенню на інструментовану ітерацію.
+        """
+        table = {"iteration": self.iterations[:self.size].copy()}
+        for i, name in enumerate(self.COUNTERS):
+            table[name] = self.counters[:self.size, i].copy()
+        for i, phase in enumerate(self.PHASES):
+            table[f"time_{phase}"] = self.timings[:self.size, i].copy()
+        return table
+
+    def report(self):
+        """Підсумок: сумарні лічильники та частка часу кожної фази."""
+        counters = self.counters[:self.size].sum(axis=0)
+        timings = self.timings[:self.size].sum(axis=0)
+        total_time = timings.sum()
+        lines = [f"Інструментованих ітерацій: {self.size}"]
+        lines += [f"  {name}: {int(value)}" for name, value in zip(self.COUNTERS, counters)]
+        lines.append(f"Час фаз (усього {total_time:.3f} с):")
+        for phase, seconds in zip(self.PHASES, timings):
+            share = seconds / total_time if total_time > 0 else 0.0
+            lines.append(f"  {phase}: {seconds:.3f} с ({share:.1%})")
+        return "\n".join(lines)
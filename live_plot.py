@@ -0,0 +1,182 @@
+import numpy as np
+
+
+# Інкрементальний графік: лінії не перебудовуються з нуля на кожному кроці
+class IncrementalLines:
+    """
+    Набір постійних ліній Line2D, дані яких зберігаються у масивах NumPy,
+    що ростуть подвоєнням ємності.
+
+    На кожному кроці на збережений фон (blitting) домальовується лише новий
+    відрізок кожної лінії, тож вартість кроку не залежить від довжини історії.
+    Повне перемальовування відбувається тільки тоді, коли точка виходить за
+    межі осей (межа по x при цьому подвоюється) або змінюється розмір вікна.
+
+    Parameters:
+        ax (matplotlib.axes.Axes): Осі графіка.
+        labels (list[str]): Підписи ліній (по одній на стовпчик значень).
+        initial_values (np.ndarray): Значення в момент часу 0.
+        ylim (tuple[float]): Початкові межі осі y.
+        capacity (int): Початкова ємність буферів.
+        colors (list[str]): Необов'язкові кольори ліній.
+    """
+
+    def __init__(self, ax, labels, initial_values, ylim=(-0.05, 1.05), capacity=1024, colors=None):
+        self.ax = ax
+        self.canvas = ax.figure.canvas
+        self.size = 0
+        self.synced_size = 0
+        self.x = np.empty(capacity)
+        self.values = np.empty((capacity, len(labels)))
+        colors = colors or [None] * len(labels)
+        self.lines = [ax.plot([], [], label=label, color=color)[0] for label, color in zip(labels, colors)]
+        # Окремі анімовані відрізки для домальовування останнього кроку
+        self.segments = [
+            ax.plot([], [], color=line.get_color(), linewidth=line.get_linewidth(), animated=True)[0]
+            for line in self.lines
+        ]
+        self.background = None
+        ax.set_xlim(0, 16)
+        ax.set_ylim(*ylim)
+        self.canvas.mpl_connect("draw_event", self._on_draw)
+        self.canvas.mpl_connect("resize_event", lambda event: self._sync_lines())
+        self.append(0, initial_values, redraw=False)
+        self._sync_lines()
+
+    def __len__(self):
+        return self.size
+
+    def _reserve(self, capacity):
+        if capacity <= len(self.x):
+            return
+        new_capacity = max(capacity, 2 * len(self.x))
+        x = np.empty(new_capacity)
+        x[:self.size] = self.x[:self.size]
+        values = np.empty((new_capacity, self.values.shape[1]))
+        values[:self.size] = self.values[:self.size]
+        self.x, self.values = x, values
+
+    def _sync_lines(self):
+        # Повні лінії потрібні лише для повного перемальовування
+        for column, line in enumerate(self.lines):
+            line.set_data(self.x[:self.size], self.values[:self.size, column])
+        self.synced_size = self.size
+
+    def _on_draw(self, event):
+        if self.synced_size < self.size:
+            # Перемальовування ініціював хтось інший, поки лінії були застарілими
+            self._sync_lines()
+            self.canvas.draw_idle()
+            return
+        self.background = self.canvas.copy_from_bbox(self.ax.bbox)
+
+    def _fits(self, x, values):
+        x_min, x_max = self.ax.get_xlim()
+        y_min, y_max = self.ax.get_ylim()
+        return x <= x_max and np.all(values >= y_min) and np.all(values <= y_max)
+
+    def _expand_limits(self, x, values):
+        x_min, x_max = self.ax.get_xlim()
+        while x > x_max:
+            x_max = x_min + 2 * (x_max - x_min)
+        y_min, y_max = self.ax.get_ylim()
+        margin = 0.05 * (y_max - y_min)
+        self.ax.set_xlim(x_min, x_max)
+        self.ax.set_ylim(min(y_min, np.min(values) - margin), max(y_max, np.max(values) + margin))
+
+    def append(self, x, values, redraw=True):
+        """Додає точку (x, values) до всіх ліній і домальовує її."""
+        values = np.asarray(values, dtype=np.float64)
+        self._reserve(self.size + 1)
+        self.x[self.size] = x
+        self.values[self.size] = values
+        self.size += 1
+        if not redraw:
+            return
+
+        if not self._fits(x, values):
+            self._expand_limits(x, values)
+            self.redraw()
+            return
+        if self.background is None or self.size < 2:
+            self.redraw()
+            return
+
+        self.canvas.restore_region(self.background)
+        for column, segment in enumerate(self.segments):
+            segment.set_data(self.x[self.size - 2:self.size], self.values[self.size - 2:self.size, column])
+            self.ax.draw_artist(segment)
+        self.canvas.blit(self.ax.bbox)
+        self.background = self.canvas.copy_from_bbox(self.ax.bbox)
+
+    def redraw(self):
+        """Повне перемальовування (наприклад, після зміни меж осей)."""
+        self._sync_lines()
+        self.background = None
+        self.canvas.draw_idle()
+
+
+# Проріджений вигляд довгого ряду: мінімум і максимум на кожен піксель
+class MinMaxDecimator:
+    """
+    Інкрементально підтримує min/max-проріджений вигляд ряду (x, y).
+
+    Ряд ділиться на не більше ніж max_buckets кошиків однакової довжини; для
+    кожного зберігаються точки мінімуму та максимуму, тож піки не губляться.
+    Коли кошики заповнюються, сусідні пари зливаються, а довжина кошика
+    подвоюється. Пам'ять і вартість view() — O(max_buckets) незалежно від
+    довжини ряду, а add() — амортизовано O(1).
+
+    Parameters:
+        max_buckets (int): Кількість кошиків (зазвичай ширина осей у пікселях).
+    """
+
+    def __init__(self, max_buckets=1000):
+        self.max_buckets = max(2, int(max_buckets)) // 2 * 2
+        self.reset()
+
+    def reset(self):
+        self.bucket_size = 1
+        self.closed = 0
+        # Стовпчики: x мінімуму, мінімум, x максимуму, максимум
+        self.buckets = np.empty((self.max_buckets, 4))
+        self.current = None
+        self.current_count = 0
+
+    def add(self, x, y):
+        if self.current is None:
+            self.current = [x, y, x, y]
+        else:
+            if y < self.current[1]:
+                self.current[0], self.current[1] = x, y
+            if y > self.current[3]:
+                self.current[2], self.current[3] = x, y
+        self.current_count += 1
+        if self.current_count == self.bucket_size:
+            self.buckets[self.closed] = self.current
+            self.closed += 1
+            self.current = None
+            self.current_count = 0
+            if self.closed == self.max_buckets:
+                self._merge_pairs()
+
+    def _merge_pairs(self):
+        left, right = self.buckets[0::2], self.buckets[1::2]
+        merged = np.empty((self.max_buckets // 2, 4))
+        take_right_min = right[:, 1] < left[:, 1]
+        merged[:, 0:2] = np.where(take_right_min[:, None], right[:, 0:2], left[:, 0:2])
+        take_right_max = right[:, 3] > left[:, 3]
+        merged[:, 2:4] = np.where(take_right_max[:, None], right[:, 2:4], left[:, 2:4])
+        self.buckets[:self.max_buckets // 2] = merged
+        self.closed = self.max_buckets // 2
+        self.bucket_size *= 2
+
+    def view(self):
+        """Точки для малювання: по дві на кошик (min і max у порядку x)."""
+        buckets = self.buckets[:self.closed]
+        if self.current is not None:
+            buckets = np.vstack([buckets, self.current])
+        min_first = buckets[:, 0] <= buckets[:, 2]
+        x = np.where(min_first[:, None], buckets[:, [0, 2]], buckets[:, [2, 0]]).ravel()
+        y = np.where(min_first[:, None], buckets[:, [1, 3]], buckets[:, [3, 1]]).ravel()
+        return x, y
@@ -1,9 +1,8 @@
-import subprocess
-
 def display_menu():
     print("\n=== Меню симуляції ===")
     print("1. Налаштувати параметри та запустити симуляцію")
-    print("2. Вийти")
+    print("2. Перебір параметрів (сітка значень)")
+    print("3. Вийти")
     choice = input("Введіть номер опції: ")
     return choice
 
@@ -23,6 +22,8 @@ def get_simulation_settings():
         mutation_rate = float(input("Шанс мутації (напр., 0.1): "))
         escape_chance = float(input("Шанс втечі (напр., 0.5): "))
         counterattack_factor = float(input("Фактор контратаки (напр., 0.1): "))
+        super_threshold = input("Поріг суперорганізмів (порожньо — зупинка при 10000): ").strip()
+        super_threshold = int(super_threshold) if super_threshold else None
 
         settings = {
             "NUM_ORGANISMS_A": num_organisms_a,
@@ -38,6 +39,7 @@ def get_simulation_settings():
             "MUTATION_RATE": mutation_rate,
             "ESCAPE_CHANCE": escape_chance,
             "COUNTERATTACK_CHANCE_FACTOR": counterattack_factor,
+            "SUPER_INDIVIDUAL_THRESHOLD": super_threshold,
         }
         return settings
     except ValueError:
@@ -50,23 +52,55 @@ def write_settings_to_file(settings):
             f.write(f"{key} = {repr(value)}\n")
     print("\nНалаштування збережено у файлі war_system_settings.py.")
 
-def run_simulation():
-    print("\nЗапуск симуляції...")
+def get_sweep_grid():
+    print("\n=== Перебір параметрів ===")
+    print("Вводьте рядки виду ESCAPE_CHANCE=0.1,0.3,0.5 (порожній рядок — завершити).")
+    grid = {}
     try:
-        subprocess.run(["python", "war_system.py"])
-    except FileNotFoundError:
-        print("\nПомилка: Файл war_system.py не знайдено. Переконайтеся, що файл знаходиться у тій самій папці.")
+        while True:
+            line = input("Параметр: ").strip()
+            if not line:
+                break
+            key, values = line.split("=", 1)
+            grid[key.strip()] = [float(v) if "." in v else int(v) for v in values.split(",")]
+    except ValueError:
+        print("\nПомилка: Введіть коректні числові значення.")
+        return None
+    return grid or None
+
+def run_sweep(grid):
+    from sweep import sweep
+
+    print("\nЗапуск перебору параметрів...")
+    try:
+        results = sweep(grid, "sweep_results.npz")
+    except ValueError as e:
+        print(f"\nПомилка: {e}")
+        return
+    print(f"\nГотово: {len(results['cell'])} клітинок збережено у файлі sweep_results.npz.")
+
+def run_simulation(settings):
+    # Симуляція запускається у цьому ж процесі; war_system імпортується лише при першому запуску
+    import war_system
+
+    print("\nЗапуск симуляції...")
+    war_system.run(settings, show=True)
 
 # Основний цикл меню
-while True:
-    choice = display_menu()
-    if choice == "1":
-        settings = get_simulation_settings()
-        if settings:
-            write_settings_to_file(settings)
-            run_simulation()
-    elif choice == "2":
-        print("\nВихід з меню.")
-        break
-    else:
-        print("\nНеправильний вибір. Спробуйте знову.")
+if __name__ == "__main__":
+    while True:
+        choice = display_menu()
+        if choice == "1":
+            settings = get_simulation_settings()
+            if settings:
+                write_settings_to_file(settings)
+                run_simulation(settings)
+        elif choice == "2":
+            grid = get_sweep_grid()
+            if grid:
+                run_sweep(grid)
+        elif choice == "3":
+            print("\nВихід з меню.")
+            break
+        else:
+            print("\nНеправильний вибір. Спробуйте знову.")
@@ -0,0 +1,225 @@
+import numpy as np
+
+
+def replicator_dynamics_batch(payoff_matrix, initial_populations, time_steps, out=None):
+    """
+    Дискретна реплікаторна динаміка одразу для багатьох популяцій (і, за бажанням, ігор).
+
+    Parameters:
+        payoff_matrix (np.ndarray): Матриця виплат (n x n), спільна для всіх популяцій,
+            або стос матриць (B x n x n) — окрема гра для кожної популяції.
+        initial_populations (np.ndarray): Початкові розподіли (B x n) або один розподіл (n).
+        time_steps (int): Кількість ітерацій симуляції.
+        out (np.ndarray): Необов'язковий попередньо виділений масив (time_steps + 1, B, n).
+
+    Returns:
+        populations (np.ndarray): Масив часток стратегій у часі, розмір (time_steps + 1, B, n).
+            Популяції з нульовим середнім фітнесом залишаються без змін.
+    """
+    payoff_matrix = np.asarray(payoff_matrix, dtype=np.float64)
+    population = np.atleast_2d(np.asarray(initial_populations, dtype=np.float64))
+    batch, n = population.shape
+    if out is None:
+        out = np.empty((time_steps + 1, batch, n))
+    elif out.shape != (time_steps + 1, batch, n):
+        raise ValueError(f"out має бути розміру {(time_steps + 1, batch, n)}, отримано {out.shape}.")
+
+    stacked = payoff_matrix.ndim == 3
+    payoff_transposed = None if stacked else payoff_matrix.T
+    fitness = np.empty((batch, n))
+    average_fitness = np.empty((batch, 1))
+
+    out[0] = population
+    for t in range(time_steps):
+        population, new_population = out[t], out[t + 1]
+        if stacked:
+            np.matmul(payoff_matrix, population[:, :, None], out=fitness[:, :, None])  # Фітнес кожної стратегії
+        else:
+            np.matmul(population, payoff_transposed, out=fitness)
+        np.multiply(population, fitness, out=new_population)
+        np.sum(new_population, axis=1, keepdims=True, out=average_fitness)  # Середній фітнес у популяції
+        stalled = average_fitness[:, 0] == 0  # Уникнення ділення на нуль
+        average_fitness[stalled] = 1
+        # x * f / (x . f) — реплікаторна динаміка разом із нормалізацією (сума часток = 1)
+        np.divide(new_population, average_fitness, out=new_population)
+        if stalled.any():
+            new_population[stalled] = population[stalled]
+    return out
+
+
+# Коефіцієнти методу Дормана-Принса 5(4)
+DOPRI_A = [np.array(row) for row in [
+    [],
+    [1 / 5],
+    [3 / 40, 9 / 40],
+    [44 / 45, -56 / 15, 32 / 9],
+    [19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729],
+    [9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176, -5103 / 18656],
+]]
+DOPRI_B = np.array([35 / 384, 0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84, 0])
+DOPRI_ERROR = np.array([71 / 57600, 0, -71 / 16695, 71 / 1920, -17253 / 339200, 22 / 525, -1 / 40])
+
+# Максимальна кількість стратегій, для якої шукаємо внутрішню рівновагу аналітично
+MAX_ANALYTIC_STRATEGIES = 10
+
+
+def replicator_velocity(payoff_matrix, population):
+    """Права частина неперервної реплікаторної динаміки: dx_i/dt = x_i (f_i - x . f)."""
+    fitness = payoff_matrix @ population
+    return population * (fitness - population @ fitness)
+
+
+def interior_fixed_point(payoff_matrix):
+    """
+    Внутрішня нерухома точка реплікаторної динаміки (усі стратегії мають однаковий фітнес).
+
+    Розв'язує систему A x = c 1, sum(x) = 1 для невеликих n.
+
+    Returns:
+        np.ndarray | None: Точка x з усіма x_i > 0 або None, якщо її немає чи вона не єдина.
+    """
+    payoff_matrix = np.asarray(payoff_matrix, dtype=np.float64)
+    n = payoff_matrix.shape[0]
+    if n > MAX_ANALYTIC_STRATEGIES:
+        return None
+    system = np.zeros((n + 1, n + 1))
+    system[:n, :n] = payoff_matrix
+    system[:n, n] = -1
+    system[n, :n] = 1
+    rhs = np.zeros(n + 1)
+    rhs[n] = 1
+    try:
+        solution = np.linalg.solve(system, rhs)
+    except np.linalg.LinAlgError:
+        return None
+    point = solution[:n]
+    return point if np.all(point > 0) else None
+
+
+def is_stable_fixed_point(payoff_matrix, point):
+    """Чи є нерухома точка асимптотично стійкою (власні числа якобіана на симплексі мають Re < 0)."""
+    n = len(point)
+    fitness = payoff_matrix @ point
+    average_fitness = point @ fitness
+    jacobian = np.diag(fitness - average_fitness) + point[:, None] * (payoff_matrix - fitness - point @ payoff_matrix)
+    # Базис дотичного простору симплекса: e_i - e_n
+    basis = np.vstack([np.eye(n - 1), -np.ones(n - 1)])
+    reduced = np.linalg.pinv(basis) @ jacobian @ basis
+    return bool(np.all(np.linalg.eigvals(reduced).real < 0))
+
+
+def replicator_ode(payoff_matrix, initial_population, t_max, t_eval=None, rtol=1e-6, atol=1e-9, tol=1e-10, snap_radius=1e-6, max_steps=100_000):
+    """
+    Неперервна реплікаторна динаміка з адаптивним кроком (Дорман-Принс 5(4)).
+
+    На відміну від дискретного оновлення, працює і з від'ємними виплатами
+    (наприклад, "Камінь, ножиці, папір"), де середній фітнес може бути нулем.
+    Інтегрування зупиняється, щойно ||dx/dt|| < tol або стан наблизився до
+    стійкої внутрішньої нерухомої точки (знайденої аналітично) ближче, ніж
+    snap_radius; решта часових точок заповнюється рівновагою. Якщо початковий
+    стан уже збігається з внутрішньою нерухомою точкою, інтегрування не
+    виконується взагалі.
+
+    Parameters:
+        payoff_matrix (np.ndarray): Матриця виплат (розмір nxn).
+        initial_population (np.ndarray): Початковий розподіл популяції (довжина n).
+        t_max (float): Кінцевий час.
+        t_eval (np.ndarray): Моменти часу для результату, не пізніші за t_max
+            (за замовчуванням 0, 1, ..., t_max).
+        rtol, atol (float): Відносна та абсолютна похибка кроку.
+        tol (float): Поріг ||dx/dt||, нижче якого стан вважається рівновагою.
+        snap_radius (float): Відстань до стійкої внутрішньої рівноваги, з якої траєкторія вважається збіжною.
+        max_steps (int): Обмеження на кількість спроб кроку (прийнятих і
+            відкинутих); після нього решта точок заповнюється останнім станом.
+
+    Returns:
+        populations (np.ndarray): Частки стратегій у моменти t_eval, розмір (len(t_eval), n).
+
+    Raises:
+        FloatingPointError: Якщо крок зменшився настільки, що t + h == t
+            (жорстка або розбіжна динаміка).
+    """
+    payoff_matrix = np.asarray(payoff_matrix, dtype=np.float64)
+    population = np.asarray(initial_population, dtype=np.float64)
+    population = population / population.sum()
+    if t_eval is None:
+        t_eval = np.arange(int(t_max) + 1, dtype=np.float64)
+    t_eval = np.asarray(t_eval, dtype=np.float64)
+    if t_eval.size and t_eval.max() > t_max:
+        raise ValueError(f"t_eval містить моменти після t_max ({t_eval.max()} > {t_max}).")
+    populations = np.empty((len(t_eval), len(population)))
+
+    fixed_point = interior_fixed_point(payoff_matrix)
+    if fixed_point is not None and np.max(np.abs(population - fixed_point)) < atol:
+        populations[:] = fixed_point
+        return populations
+    attractor = fixed_point if fixed_point is not None and is_stable_fixed_point(payoff_matrix, fixed_point) else None
+
+    t = 0.0
+    velocity = replicator_velocity(payoff_matrix, population)
+    h = min(0.1, t_max) if t_max > 0 else 0.0
+    k = np.empty((7, len(population)))
+    next_eval = 0
+    # Точки, що збігаються з початковим моментом
+    while next_eval < len(t_eval) and t_eval[next_eval] <= t:
+        populations[next_eval] = population
+        next_eval += 1
+
+    steps = 0
+    while next_eval < len(t_eval) and steps < max_steps:
+        if attractor is not None and np.max(np.abs(population - attractor)) < snap_radius:
+            population = attractor
+            break
+        if np.linalg.norm(velocity) < tol:
+            break
+        h = min(h, t_max - t)
+        if t + h == t:
+            raise FloatingPointError(f"Крок інтегрування зменшився до нуля в момент t = {t}.")
+        steps += 1
+        k[0] = velocity
+        for stage in range(1, 6):
+            k[stage] = replicator_velocity(payoff_matrix, population + h * (DOPRI_A[stage] @ k[:stage]))
+        new_population = population + h * (DOPRI_B[:6] @ k[:6])
+        k[6] = replicator_velocity(payoff_matrix, new_population)
+        scale = atol + rtol * np.maximum(np.abs(population), np.abs(new_population))
+        error = np.sqrt(np.mean((h * (DOPRI_ERROR @ k) / scale) ** 2))
+        if not np.isfinite(error):
+            h *= 0.2  # Переповнення або NaN на цьому кроці — відкидаємо його
+            continue
+        if error > 1:
+            h *= max(0.2, 0.9 * error ** -0.2)
+            continue
+
+        # Щільний вивід: кубічна інтерполяція Ерміта між кінцями прийнятого кроку
+        new_t = t + h
+        new_velocity = k[6]
+        last_eval = np.searchsorted(t_eval, new_t, side="right")
+        if last_eval > next_eval:
+            s = ((t_eval[next_eval:last_eval] - t) / h)[:, None]
+            populations[next_eval:last_eval] = (
+                (2 * s**3 - 3 * s**2 + 1) * population
+                + (s**3 - 2 * s**2 + s) * h * velocity
+                + (-2 * s**3 + 3 * s**2) * new_population
+                + (s**3 - s**2) * h * new_velocity
+            )
+            populations[next_eval:last_eval] /= populations[next_eval:last_eval].sum(axis=1, keepdims=True)
+            next_eval = last_eval
+
+        t = new_t
+        population = new_population / new_population.sum()  # Нормалізація (сума часток = 1)
+        velocity = new_velocity
+        h *= min(5.0, 0.9 * error ** -0.2) if error > 0 else 5.0
+
+    populations[next_eval:] = population
+    return populations
+
+
+if __name__ == "__main__":
+    # Басейни притягання "Полювання на оленя" для мільйона початкових часток
+    payoff_matrix = np.array([
+        [3, 0],  # Виграші для "Оленя"
+        [2, 2]   # Виграші для "Кролика"
+    ])
+    stag = np.linspace(0.0, 1.0, 1_000_000)
+    populations = replicator_dynamics_batch(payoff_matrix, np.column_stack([stag, 1 - stag]), 50)
+    print(f"Частка початкових станів, що ведуть до 'Оленя': {np.mean(populations[-1, :, 0] > 0.5):.3f}")
@@ -0,0 +1,93 @@
+import numpy as np
+
+
+# Облік ресурсів за віковими когортами замість окремих об'єктів Resource
+class ResourceLedger:
+    """
+    Кільцевий буфер довжини expiration + 1: у кожній комірці сума ресурсів
+    одного віку. Усі ресурси, створені на одній ітерації, старіють разом, тож
+    старіння — це лише зсув покажчика, а загальна кількість — поточна сума.
+    Вартість ітерації не залежить від RESOURCE_GENERATION.
+
+    Поведінка збігається зі списком Resource: ресурс вважається простроченим,
+    коли його вік перевищує expiration.
+
+    З параметром cells кожна когорта — масив NumPy з окремою сумою для
+    кожної клітинки ґратки (total теж масив), а consume() забирає спожиті
+    ресурси з клітинок.
+
+    Parameters:
+        expiration (int): Термін придатності ресурсів (RESOURCE_EXPIRATION).
+        initial_amount (float | np.ndarray): Ресурси віку 0 на старті.
+        cells (int | None): Кількість клітинок ґратки (None — один спільний пул).
+    """
+
+    def __init__(self, expiration, initial_amount=0, cells=None):
+        self.expiration = expiration
+        self.cells = cells
+        self.cohorts = [self._empty() for _ in range(expiration + 1)]
+        self.head = 0  # Комірка когорти віку 0
+        self.total = self._empty()
+        if np.any(initial_amount):
+            self.add(initial_amount)
+
+    def _empty(self):
+        return 0 if self.cells is None else np.zeros(self.cells)
+
+    def add(self, amount):
+        """Додає нові ресурси (вік 0)."""
+        self.cohorts[self.head] += amount
+        self.total += amount
+
+    def age_one_turn(self):
+        """Старіння всіх ресурсів на одну ітерацію з видаленням прострочених."""
+        oldest = (self.head + 1) % len(self.cohorts)
+        self.total -= self.cohorts[oldest]
+        self.cohorts[oldest] = self._empty()
+        self.head = oldest
+
+    def consume(self, amount):
+        """Забирає amount (для ґратки — масив по клітинках), починаючи з найстаріших когорт."""
+        remaining = amount
+        size = len(self.cohorts)
+        for age in range(size - 1, -1, -1):
+            index = (self.head - age) % size
+            taken = np.minimum(self.cohorts[index], remaining)
+            self.cohorts[index] = self.cohorts[index] - taken
+            remaining = remaining - taken
+        self.total = sum(self.cohorts)
+
+    def by_age(self):
+        """Суми ресурсів для віку 0, 1, ..., expiration."""
+        size = len(self.cohorts)
+        return [self.cohorts[(self.head - age) % size] for age in range(size)]
+
+    def state(self):
+        """Стан для контрольної точки (JSON-сумісний словник)."""
+        return {
+            "expiration": self.expiration,
+            "cells": self.cells,
+            "cohorts": [np.asarray(cohort).tolist() for cohort in self.cohorts],
+            "head": self.head,
+            "total": np.asarray(self.total).tolist(),
+        }
+
+    @classmethod
+    def from_state(cls, state):
+        cells = state.get("cells")
+        ledger = cls(state["expiration"], cells=cells)
+        convert = (lambda value: value) if cells is None else np.array
+        ledger.cohorts = [convert(cohort) for cohort in state["cohorts"]]
+        ledger.head = state["head"]
+        ledger.total = convert(state["total"])
+        return ledger
+
+    def set_expiration(self, expiration):
+        """Змінює термін придатності, зберігаючи когорти, які ще не прострочені."""
+        kept = self.by_age()[:expiration + 1]
+        self.expiration = expiration
+        self.cohorts = [self._empty() for _ in range(expiration + 1)]
+        self.head = 0
+        for age, amount in enumerate(kept):
+            self.cohorts[-age % len(self.cohorts)] = amount
+        self.total = sum(self.cohorts)
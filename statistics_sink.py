@@ -0,0 +1,130 @@
+import json
+
+import numpy as np
+
+# Заголовок файлу статистики: перший рядок — JSON з назвами стовпчиків
+STREAM_FORMAT = "war-statistics-v1"
+STREAM_DTYPE = np.dtype("<f8")
+
+
+# Статистика в пам'яті: словник списків, як і раніше
+class MemorySink:
+    """Зберігає рядки статистики у словнику columns (назва стовпчика -> список)."""
+
+    def __init__(self):
+        self.columns = None
+
+    def open(self, names):
+        self.columns = {name: [] for name in names}
+
+    def write(self, row):
+        for name, values in self.columns.items():
+            values.append(row[name])
+
+    def close(self):
+        pass
+
+
+# Потокова статистика: рядки дописуються у файл блоками фіксованого розміру
+class StreamingSink:
+    """
+    Записує рядки статистики у двійковий файл лише для дописування.
+
+    Файл складається з рядка-заголовка (JSON з назвами стовпчиків) і далі
+    рядків float64 (little-endian) по одному значенню на стовпчик. Рядки
+    накопичуються у попередньо виділеному блоці з chunk_size рядків і
+    записуються, коли блок заповнюється, тож пам'ять не росте з кількістю
+    ітерацій. Файл можна читати функцією read_statistics() під час запуску.
+
+    Parameters:
+        path (str): Шлях до файлу (перезаписується).
+        chunk_size (int): Кількість рядків в одному блоці запису.
+    """
+
+    def __init__(self, path, chunk_size=1024):
+        self.path = path
+        self.chunk_size = chunk_size
+        self.names = None
+        self.file = None
+        self.chunk = None
+        self.filled = 0
+        self.rows = 0  # Усього записаних рядків (разом із ненаписаними на диск)
+
+    def open(self, names):
+        self.names = list(names)
+        self.chunk = np.empty((self.chunk_size, len(self.names)), dtype=STREAM_DTYPE)
+        self.filled = 0
+        self.rows = 0
+        self.file = open(self.path, "wb")
+        header = json.dumps({"format": STREAM_FORMAT, "columns": self.names})
+        self.file.write(header.encode() + b"\n")
+        self.file.flush()
+
+    def resume(self, names, rows):
+        """
+        Продовжує існуючий файл після рядка rows (наприклад, з контрольної
+        точки): рядки, дописані після неї, відкидаються.
+        """
+        self.names = list(names)
+        self.chunk = np.empty((self.chunk_size, len(self.names)), dtype=STREAM_DTYPE)
+        self.filled = 0
+        self.file = open(self.path, "r+b")
+        header = json.loads(self.file.readline())
+        if header.get("format") != STREAM_FORMAT or header["columns"] != self.names:
+            self.file.close()
+            self.file = None
+            raise ValueError(f"Файл {self.path} не відповідає стовпчикам статистики.")
+        self.file.truncate(self.file.tell() + rows * len(self.names) * STREAM_DTYPE.itemsize)
+        self.file.seek(0, 2)
+        self.rows = rows
+
+    def write(self, row):
+        self.chunk[self.filled] = [row[name] for name in self.names]
+        self.filled += 1
+        self.rows += 1
+        if self.filled == self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        """Записує накопичені рядки (зокрема неповний блок) на диск."""
+        if self.filled:
+            self.file.write(self.chunk[:self.filled].tobytes())
+            self.filled = 0
+        self.file.flush()
+
+    def close(self):
+        if self.file is not None:
+            self.flush()
+            self.file.close()
+            self.file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def read_statistics(path, start=0):
+    """
+    Зчитує статистику, записану StreamingSink (зокрема під час запуску).
+
+    Parameters:
+        path (str): Шлях до файлу.
+        start (int): Номер першого рядка; дашборд може передавати кількість
+            уже прочитаних рядків, щоб отримувати лише нові.
+
+    Returns:
+        dict: Назва стовпчика -> np.ndarray. Недописаний останній рядок ігнорується.
+    """
+    with open(path, "rb") as f:
+        header = json.loads(f.readline())
+        if header.get("format") != STREAM_FORMAT:
+            raise ValueError(f"Файл {path} не є файлом статистики.")
+        names = header["columns"]
+        row_size = len(names) * STREAM_DTYPE.itemsize
+        f.seek(start * row_size, 1)
+        data = f.read()
+    rows = len(data) // row_size
+    table = np.frombuffer(data[:rows * row_size], dtype=STREAM_DTYPE).reshape(rows, len(names))
+    return {name: table[:, column] for column, name in enumerate(names)}
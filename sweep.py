@@ -0,0 +1,194 @@
+import itertools
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from engine import DEFAULT_SETTINGS, WarSimulation
+
+# Стовпчики результатів для кожної клітинки сітки (окрім самих параметрів)
+RESULT_COLUMNS = (
+    "extinction_iteration",
+    "explosion_iteration",
+    "final_size_a",
+    "final_size_b",
+    "mean_efficiency_a",
+    "mean_efficiency_b",
+)
+
+
+def run_cell(settings, seed):
+    """Один запуск для клітинки сітки; -1 означає, що подія не сталася."""
+    simulation = WarSimulation(settings, seed=seed)
+    status = simulation.run()
+    statistics = simulation.statistics
+    last_iteration = simulation.iteration - 1
+    return {
+        "extinction_iteration": last_iteration if status == "extinct" else -1,
+        "explosion_iteration": last_iteration if status == "explosion" else -1,
+        "final_size_a": statistics["population_size_a"][-1] if statistics["iteration"] else 0,
+        "final_size_b": statistics["population_size_b"][-1] if statistics["iteration"] else 0,
+        "mean_efficiency_a": float(np.mean(statistics["average_efficiency_a"])) if statistics["iteration"] else 0.0,
+        "mean_efficiency_b": float(np.mean(statistics["average_efficiency_b"])) if statistics["iteration"] else 0.0,
+    }
+
+
+# Ключ файлу .npz з метаданими перебору (JSON): фіксовані налаштування,
+# зерна і стовпчики сітки, записані як JSON
+METADATA_KEY = "metadata"
+
+
+def _json_default(value):
+    # Скаляри і масиви NumPy у значеннях сітки та налаштуваннях
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"Непідтримуваний тип {type(value).__name__}")
+
+
+def _normalize(value):
+    """Значення у тому вигляді, в якому воно повертається з JSON (для порівняння)."""
+    return json.loads(json.dumps(value, default=_json_default))
+
+
+def _is_plain(value):
+    """Чи можна зберегти значення сітки у звичайному числовому чи рядковому стовпчику."""
+    return isinstance(value, (bool, int, float, str, np.bool_, np.number, np.str_))
+
+
+def _object_column(values):
+    # Стовпчик довільних значень (None, списки) без розгортання списків у виміри
+    column = np.empty(len(values), dtype=object)
+    for i, value in enumerate(values):
+        column[i] = value
+    return column
+
+
+def load_metadata(path):
+    """Метадані перебору з файлу .npz (None, якщо їх немає)."""
+    with np.load(path) as data:
+        if METADATA_KEY not in data.files:
+            return None
+        return json.loads(str(data[METADATA_KEY]))
+
+
+def load_table(path):
+    """Завантажує таблицю результатів (стовпчик -> масив) з файлу .npz."""
+    metadata = load_metadata(path) or {}
+    json_columns = metadata.get("json_columns", [])
+    with np.load(path) as data:
+        table = {name: data[name] for name in data.files if name != METADATA_KEY}
+    for name in json_columns:
+        table[name] = _object_column([json.loads(str(value)) for value in table[name]])
+    return table
+
+
+def save_table(table, path, metadata):
+    # Запис через тимчасовий файл, щоб аварійне завершення не пошкодило таблицю.
+    # Стовпчики з json_columns (значення на зразок None) записуються як рядки
+    # JSON, бо масиви об'єктів np.load без allow_pickle не читає.
+    json_columns = metadata["json_columns"]
+    arrays = {
+        name: np.array([json.dumps(value, default=_json_default) for value in column], dtype=str)
+        if name in json_columns else np.asarray(column)
+        for name, column in table.items()
+    }
+    arrays[METADATA_KEY] = np.array(json.dumps(metadata, default=_json_default))
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        np.savez(f, **arrays)
+    os.replace(tmp_path, path)
+
+
+def sweep(grid, path, base_settings=None, seeds=(0,), max_workers=None, flush_every=16):
+    """
+    Перебір параметрів war-симуляції по сітці з паралельним виконанням.
+
+    Parameters:
+        grid (dict): Ключ налаштувань -> послідовність значень
+            (список, range, np.linspace, ...). Сітка — декартів добуток.
+        path (str): Файл .npz зі стовпчиковою таблицею результатів.
+        base_settings (dict): Значення решти параметрів.
+        seeds (tuple[int]): Зерна, з якими запускається кожна клітинка.
+        max_workers (int | None): Кількість процесів (None — усі ядра).
+        flush_every (int): Як часто (у завершених клітинках) зберігати таблицю.
+
+    Returns:
+        dict: Таблиця зі стовпчиками "cell", "seed", параметрів сітки та RESULT_COLUMNS,
+        впорядкована за номером клітинки. Якщо файл path уже існує, завершені
+        клітинки не перераховуються; файл має бути отриманий з тими самими
+        сіткою, налаштуваннями і зернами, інакше виникає ValueError.
+    """
+    unknown = [key for key in grid if key not in DEFAULT_SETTINGS]
+    if unknown:
+        raise ValueError(f"Невідомі параметри: {', '.join(unknown)}")
+    settings = {**DEFAULT_SETTINGS, **(base_settings or {})}
+    keys = list(grid)
+    cells = list(itertools.product(*(list(grid[key]) for key in keys), seeds))
+
+    columns = ["cell", "seed", *keys, *RESULT_COLUMNS]
+    # Налаштування, що не змінюються по сітці, визначають результати разом із нею
+    metadata = {
+        "settings": _normalize({key: value for key, value in settings.items() if key not in grid}),
+        "seeds": _normalize(list(seeds)),
+        "json_columns": [key for key in keys if not all(_is_plain(value) for value in grid[key])],
+    }
+    table = {name: [] for name in columns}
+    if os.path.exists(path):
+        previous_metadata = load_metadata(path)
+        if previous_metadata is None:
+            raise ValueError(f"Файл {path} не містить метаданих перебору.")
+        if previous_metadata["settings"] != metadata["settings"]:
+            raise ValueError(f"Файл {path} містить результати з іншими налаштуваннями.")
+        if previous_metadata["seeds"] != metadata["seeds"]:
+            raise ValueError(f"Файл {path} містить результати з іншими зернами.")
+        previous = load_table(path)
+        if set(previous) != set(columns):
+            raise ValueError(f"Файл {path} містить результати іншої сітки.")
+        for row in range(len(previous["cell"])):
+            cell = int(previous["cell"][row])
+            values = [previous[name][row] for name in (*keys, "seed")]
+            if cell >= len(cells) or _normalize(values) != _normalize(list(cells[cell])):
+                raise ValueError(f"Файл {path} містить результати іншої сітки.")
+        table = {name: list(previous[name]) for name in columns}
+    done = set(int(cell) for cell in table["cell"])
+
+    pending = 0
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {}
+        for cell, (*values, seed) in enumerate(cells):
+            if cell in done:
+                continue
+            futures[executor.submit(run_cell, {**settings, **dict(zip(keys, values))}, seed)] = cell
+        for future in as_completed(futures):
+            cell = futures[future]
+            *values, seed = cells[cell]
+            row = {"cell": cell, "seed": seed, **dict(zip(keys, values)), **future.result()}
+            for name in columns:
+                table[name].append(row[name])
+            pending += 1
+            if pending >= flush_every:
+                save_table(table, path, metadata)
+                pending = 0
+    save_table(table, path, metadata)
+
+    order = np.argsort(table["cell"])
+    return {
+        name: (_object_column(column) if name in metadata["json_columns"] else np.asarray(column))[order]
+        for name, column in table.items()
+    }
+
+
+if __name__ == "__main__":
+    results = sweep(
+        {
+            "ESCAPE_CHANCE": np.linspace(0.1, 0.5, 5),
+            "PREDATION_THRESHOLD": range(2, 7),
+            "RESOURCE_GENERATION": [10, 20, 30],
+        },
+        "sweep_results.npz",
+    )
+    for row in range(len(results["cell"])):
+        print(", ".join(f"{name}={results[name][row]}" for name in results))
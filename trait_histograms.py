@@ -0,0 +1,164 @@
+import os
+
+import numpy as np
+
+
+# Розподіли ознак організмів за ітераціями
+class TraitHistograms:
+    """
+    Гістограми з фіксованими кошиками і квантилі (P10/P50/P90) ефективності
+    та ресурсів кожного виду на кожній ітерації.
+
+    Гістограми всіх видів однієї ознаки рахуються одним викликом bincount за
+    ключем вид * bins + кошик, а квантилі — за накопиченими сумами гістограми
+    з лінійною інтерполяцією всередині кошика, тож сортування не потрібне і
+    на ітерацію зберігається лише O(видів * bins) чисел. Значення поза
+    діапазоном ознаки потрапляють у крайні кошики (квантилі там наближені).
+    Суперорганізми враховуються з вагою.
+
+    Дані зберігаються в масивах NumPy (рядок на ітерацію), що ростуть
+    подвоєнням ємності, як в Instrumentation; кількість видів визначається
+    під час першого запису.
+
+    Parameters:
+        bins (int): Кількість кошиків.
+        ranges (dict | None): Ознака -> (мінімум, максимум) діапазону кошиків
+            (відсутні беруться з DEFAULT_RANGES).
+        capacity (int): Початкова кількість рядків.
+    """
+
+    TRAITS = ("efficiency", "resources")
+    QUANTILES = (0.1, 0.5, 0.9)
+    DEFAULT_RANGES = {"efficiency": (0.0, 1.5), "resources": (0.0, 500.0)}
+
+    def __init__(self, bins=50, ranges=None, capacity=1024):
+        self.bins = bins
+        self.ranges = {**self.DEFAULT_RANGES, **(ranges or {})}
+        self.capacity = capacity
+        self.num_species = None
+        self.size = 0
+
+    def _allocate(self, num_species):
+        self.num_species = num_species
+        self.iterations = np.empty(self.capacity, dtype=np.int64)
+        self.counts = {trait: np.zeros((self.capacity, num_species, self.bins), dtype=np.int64) for trait in self.TRAITS}
+        self.quantiles = {trait: np.zeros((self.capacity, num_species, len(self.QUANTILES))) for trait in self.TRAITS}
+
+    def _reserve(self, capacity):
+        if capacity <= len(self.iterations):
+            return
+        new_capacity = max(capacity, 2 * len(self.iterations))
+        grown = np.empty(new_capacity, dtype=np.int64)
+        grown[:self.size] = self.iterations[:self.size]
+        self.iterations = grown
+        for table in (self.counts, self.quantiles):
+            for trait, old in table.items():
+                grown = np.zeros((new_capacity, *old.shape[1:]), dtype=old.dtype)
+                grown[:self.size] = old[:self.size]
+                table[trait] = grown
+
+    def edges(self, trait):
+        """Межі кошиків ознаки trait (bins + 1 значень)."""
+        low, high = self.ranges[trait]
+        return np.linspace(low, high, self.bins + 1)
+
+    def record(self, iteration, population, num_species):
+        """Додає рядок з гістограмами і квантилями популяції population."""
+        if self.num_species is None:
+            self._allocate(num_species)
+        self._reserve(self.size + 1)
+        self.iterations[self.size] = iteration
+        species = population.species_index()
+        np.multiply(species, self.bins, out=species)  # Зсув ключа виду
+        key = population.scratch("histogram_key", np.intp)
+        position = population.scratch("histogram_position", np.float64)
+        weight = population.weight if population.weighted else None
+        for trait in self.TRAITS:
+            low, high = self.ranges[trait]
+            # Номер кошика: floor((x - low) * bins / (high - low)), обмежений [0, bins - 1]
+            np.subtract(getattr(population, trait), low, out=position)
+            np.multiply(position, self.bins / (high - low), out=position)
+            np.clip(position, 0, self.bins - 1, out=position)
+            np.copyto(key, position, casting="unsafe")
+            np.add(key, species, out=key)
+            counts = np.bincount(key, weights=weight, minlength=self.num_species * self.bins)
+            counts = counts.reshape(self.num_species, self.bins)
+            self.counts[trait][self.size] = counts
+            self.quantiles[trait][self.size] = self._quantiles(counts, low, high)
+        self.size += 1
+
+    def _quantiles(self, counts, low, high):
+        """Квантилі QUANTILES за гістограмами (рядок на вид; NaN для вимерлих видів)."""
+        cumulative = np.cumsum(counts, axis=1)
+        total = cumulative[:, -1:]
+        target = total * np.array(self.QUANTILES)  # (видів, квантилів)
+        # Перший кошик, у якому накопичена сума досягає цілі
+        index = np.minimum((cumulative[:, None, :] < target[:, :, None]).sum(axis=2), self.bins - 1)
+        before = np.where(index > 0, np.take_along_axis(cumulative, np.maximum(index - 1, 0), axis=1), 0)
+        inside = np.take_along_axis(counts, index, axis=1)
+        fraction = np.divide(target - before, inside, out=np.zeros(target.shape), where=inside > 0)
+        values = low + (index + fraction) * (high - low) / self.bins
+        values[total[:, 0] == 0] = np.nan
+        return values
+
+    def table(self):
+        """
+        Returns:
+            dict: "iteration"; для кожної ознаки "<ознака>_counts" (ітерацій x
+            видів x bins), "<ознака>_edges" і "<ознака>_p10"/"_p50"/"_p90"
+            (ітерацій x видів).
+        """
+        table = {"iteration": self.iterations[:self.size].copy() if self.size else np.zeros(0, dtype=np.int64)}
+        for trait in self.TRAITS:
+            table[f"{trait}_edges"] = self.edges(trait)
+            if not self.size:
+                continue
+            table[f"{trait}_counts"] = self.counts[trait][:self.size].copy()
+            for i, q in enumerate(self.QUANTILES):
+                table[f"{trait}_p{round(q * 100)}"] = self.quantiles[trait][:self.size, :, i].copy()
+        return table
+
+    def heatmap(self, trait, species=0):
+        """
+        Часовий ряд розподілу для теплової карти.
+
+        Parameters:
+            trait (str): "efficiency" або "resources".
+            species (int): Номер виду.
+
+        Returns:
+            tuple: (ітерації, межі кошиків, матриця bins x ітерацій із
+            частками організмів виду в кожному кошику).
+        """
+        if not self.size:
+            return np.zeros(0, dtype=np.int64), self.edges(trait), np.zeros((self.bins, 0))
+        counts = self.counts[trait][:self.size, species].T.astype(np.float64)
+        totals = counts.sum(axis=0)
+        np.divide(counts, totals, out=counts, where=totals > 0)
+        return self.iterations[:self.size].copy(), self.edges(trait), counts
+
+    def save(self, path):
+        """Зберігає table() у файл .npz (через тимчасовий файл)."""
+        tmp_path = path + ".tmp.npz"
+        np.savez_compressed(tmp_path, **self.table())
+        os.replace(tmp_path, path)
+
+    def plot_heatmap(self, trait, species=0, ax=None, label=None):
+        """Теплова карта розподілу з лініями квантилів (matplotlib імпортується лише тут)."""
+        import matplotlib.pyplot as plt
+
+        if ax is None:
+            ax = plt.gca()
+        iterations, edges, density = self.heatmap(trait, species)
+        if len(iterations):
+            ax.imshow(
+                density, origin="lower", aspect="auto", cmap="viridis",
+                extent=(iterations[0] - 0.5, iterations[-1] + 0.5, edges[0], edges[-1]),
+            )
+            for i, q in enumerate(self.QUANTILES):
+                ax.plot(iterations, self.quantiles[trait][:self.size, species, i], color="white",
+                        linewidth=1.5 if q == 0.5 else 0.8, linestyle="-" if q == 0.5 else "--")
+        ax.set_xlabel("Iteration")
+        ax.set_ylabel(trait.capitalize())
+        ax.set_title(f"{trait.capitalize()} Distribution{f' ({label})' if label else ''}")
+        return ax
@@ -1,5 +1,11 @@
-import random
-import matplotlib.pyplot as plt
+import ast
+import os
+
+from checkpoint import load_checkpoint, save_checkpoint
+from engine import WarSimulation
+from genealogy import Genealogy
+from statistics_sink import StreamingSink, read_statistics
+from trait_histograms import TraitHistograms
 
 # Налаштування симуляції
 NUM_ORGANISMS_A = 100
@@ -17,183 +23,152 @@ STARTING_RESOURCES = 160
 PREDATION_GAIN = 40
 ESCAPE_CHANCE = 0.3 # Шанс втечі
 COUNTERATTACK_CHANCE_FACTOR = 0.1  # Коефіцієнт для розрахунку шансу контратаки
-
-# Клас для ресурсів
-class Resource:
-    def __init__(self, amount):
-        self.amount = amount
-        self.age = 0
-
-    def age_one_turn(self):
-        self.age += 1
-
-    def is_expired(self):
-        return self.age > RESOURCE_EXPIRATION
-
-# Базовий клас для організмів
-class Organism:
-    def __init__(self, efficiency, reproduction_cost):
-        self.efficiency = efficiency
-        self.resources = STARTING_RESOURCES
-        self.no_resources_turns = 0
-        self.reproduction_ready_turns = 0
-        self.time_since_last_reproduction = 0
-        self.reproduction_cost = reproduction_cost
-        self.age = 0
-
-    def age_one_turn(self):
-        self.age += 1
-
-    def is_expired(self):
-        return self.age > EXPIRED
-    def compete(self, available_resources):
-        needed = max(RESOURCE_COST, self.efficiency)
-        gained = self.efficiency*available_resources
-        self.resources += gained
-        return gained
-
-    def can_reproduce(self):
-        return self.reproduction_ready_turns >= 3
-
-    def ready_for_reproduction(self):
-        if self.resources >= self.reproduction_cost:
-            self.reproduction_ready_turns += 1
-        else:
-            self.reproduction_ready_turns = 0
-
-    def reproduce(self):
-        self.resources -= self.reproduction_cost
-        self.reproduction_ready_turns = 0
-        self.time_since_last_reproduction = 0
-        new_efficiency = max(0.1, self.efficiency + random.uniform(-MUTATION_RATE, MUTATION_RATE))
-        return self.__class__(new_efficiency, self.reproduction_cost)
-
-    def survive(self):
-        if self.resources >= RESOURCE_COST:
-            self.resources -= RESOURCE_COST
-            self.no_resources_turns = 0
-        else:
-            self.no_resources_turns += 1
-        self.time_since_last_reproduction += 1
-
-    def is_dead(self):
-        return self.no_resources_turns >= 2
-
-# Група A: стандартні організми
-class OrganismA(Organism):
-    def __init__(self, efficiency, reproduction_cost = RESOURCE_REPRODUCTION_COST_A):
-        super().__init__(efficiency, RESOURCE_REPRODUCTION_COST_A)
-    def can_reproduce(self):
-        return self.reproduction_ready_turns >= 3
-    def attempt_escape_or_counterattack(self, predator):
-        if random.random() < ESCAPE_CHANCE:  # Шанс втечі
-            predator.resources += self.resources
-            self.resources = 0
-            return "escaped"
-        else:
-            counterattack_chance = self.efficiency * COUNTERATTACK_CHANCE_FACTOR
-            if random.random() < counterattack_chance:
-                return "counterattack"
-            return "attacked"
-
-# Група B: хижаки
-class OrganismB(Organism):
-    def __init__(self, efficiency, reproduction_cost = RESOURCE_REPRODUCTION_COST_B):
-        super().__init__(efficiency * 0.5, RESOURCE_REPRODUCTION_COST_B)
-
-    def is_stressed(self):
-        return self.resources < RESOURCE_COST or self.time_since_last_reproduction > PREDATION_THRESHOLD
-    def can_reproduce(self):
-        return self.reproduction_ready_turns >= 7
-    def prey_on(self, victim):
-        if True: #isinstance(victim, OrganismA):
-            outcome = victim.attempt_escape_or_counterattack(self)
-            if outcome == "escaped":
-                return False  # Жертва втекла
-            elif outcome == "counterattack":
-                return "killed"  # Хижак помер через контратаку
-            else:
-                self.resources += victim.resources
-                victim.resources = 0
-                return True
-        return False
-
-# Ініціалізація популяції
-population = [OrganismA(random.uniform(0.1, 1.0)) for _ in range(NUM_ORGANISMS_A)] + \
-             [OrganismB(random.uniform(0.1, 1.0)) for _ in range(NUM_ORGANISMS_B)]
-resources = [Resource(RESOURCE_GENERATION) for _ in range(RESOURCE_GENERATION)]
-statistics = {"iteration": [], "population_size_a": [], "population_size_b": [], "average_efficiency_a": [], "average_efficiency_b": []}
-
-# Основний цикл симуляції
-for iteration in range(NUM_ITERATIONS):
-    resources.extend(Resource(RESOURCE_GENERATION) for _ in range(RESOURCE_GENERATION))
-    for resource in resources:
-        resource.age_one_turn()
-    resources = [r for r in resources if not r.is_expired()]
-    total_available_resources = sum(r.amount for r in resources)
-
-    random.shuffle(population)
-    for organism in population:
-        organism.age_one_turn()
-        if total_available_resources <= 0:
+# Понад цей поріг організми об'єднуються у зважені суперорганізми замість зупинки
+# симуляції при 10000 організмів у групі (None — зупинка, як раніше)
+SUPER_INDIVIDUAL_THRESHOLD = None
+# Поділ ресурсів: "sequential", "proportional" або "legacy" (як у старій об'єктній моделі)
+COMPETITION_MODE = "sequential"
+# Сторона ґратки для просторової моделі (None — добре перемішана популяція)
+GRID_SIZE = None
+
+# Файл, у який menu.py записує налаштування
+SETTINGS_FILE = "war_system_settings.py"
+SETTINGS_KEYS = (
+    "NUM_ORGANISMS_A", "NUM_ORGANISMS_B", "NUM_ITERATIONS", "RESOURCE_GENERATION", "RESOURCE_COST",
+    "RESOURCE_REPRODUCTION_COST_A", "RESOURCE_REPRODUCTION_COST_B", "RESOURCE_EXPIRATION", "EXPIRED",
+    "MUTATION_RATE", "PREDATION_THRESHOLD", "STARTING_RESOURCES", "PREDATION_GAIN", "ESCAPE_CHANCE",
+    "COUNTERATTACK_CHANCE_FACTOR", "SUPER_INDIVIDUAL_THRESHOLD", "COMPETITION_MODE",
+    "GRID_SIZE",
+)
+
+
+def default_settings():
+    """Налаштування з констант на початку цього файлу."""
+    return {key: globals()[key] for key in SETTINGS_KEYS}
+
+
+def load_settings(path=SETTINGS_FILE):
+    """
+    Зчитує налаштування, збережені menu.py (рядки виду KEY = value).
+    Відсутні у файлі параметри беруться з default_settings().
+    """
+    settings = default_settings()
+    if not os.path.exists(path):
+        return settings
+    with open(path) as f:
+        for line in f:
+            if "=" not in line:
+                continue
+            key, value = line.split("=", 1)
+            settings[key.strip()] = ast.literal_eval(value.strip())
+    return settings
+
+
+def run(settings=None, seed=None, show=False, statistics_path=None, instrument=False,
+        checkpoint_path=None, checkpoint_every=100, resume=False, storage=None, histograms_path=None,
+        genealogy_path=None):
+    """
+    Запускає war-симуляцію у поточному процесі.
+
+    Parameters:
+        settings (dict): Параметри симуляції; відсутні беруться з default_settings().
+        seed (int | None): Зерно генератора випадкових чисел.
+        show (bool): Показати графіки після завершення (matplotlib імпортується лише тоді).
+        statistics_path (str | None): Файл, у який статистика пишеться під час
+            запуску (StreamingSink); пам'ять тоді не росте з кількістю ітерацій.
+        instrument (bool): Зібрати лічильники подій і час фаз та надрукувати підсумок.
+        checkpoint_path (str | None): Каталог контрольної точки, яка оновлюється
+            кожні checkpoint_every ітерацій і наприкінці запуску.
+        checkpoint_every (int): Період збереження контрольної точки.
+        resume (bool): Продовжити з checkpoint_path, якщо контрольна точка існує
+            (settings, seed і statistics_path тоді беруться з неї).
+        storage (str | None): Каталог для популяції у файлах, відображених у
+            пам'ять (для популяцій, більших за оперативну пам'ять; тоді варто
+            вимкнути POPULATION_LIMIT, передавши None).
+        histograms_path (str | None): Файл .npz для гістограм і квантилів
+            ефективності та ресурсів кожної групи (TraitHistograms); з show
+            показуються також теплові карти ефективності. Після resume
+            гістограми починаються з ітерації контрольної точки.
+        genealogy_path (str | None): Файл .npz для родоводу (Genealogy) з
+            id батька, ітераціями народження і смерті кожного організму
+            (лише для нового запуску без SUPER_INDIVIDUAL_THRESHOLD: родовід
+            не зберігається в контрольній точці).
+
+    Returns:
+        dict: Статистика симуляції за ітераціями (зі statistics_path — зчитана з файлу).
+    """
+    if resume and checkpoint_path and os.path.exists(checkpoint_path):
+        simulation = load_checkpoint(checkpoint_path, instrument=instrument, storage=storage)
+        statistics_path = getattr(simulation.sink, "path", None)
+        print(f"Продовження з {simulation.iteration}-ї ітерації.")
+    else:
+        settings = {**default_settings(), **(settings or {})}
+        sink = StreamingSink(statistics_path) if statistics_path else None
+        genealogy = Genealogy() if genealogy_path else None
+        simulation = WarSimulation(settings, seed=seed, sink=sink, instrument=instrument, storage=storage, genealogy=genealogy)
+    histograms = TraitHistograms() if histograms_path else None
+    simulation.histograms = histograms
+
+    # Основний цикл симуляції
+    while simulation.iteration < simulation.settings["NUM_ITERATIONS"]:
+        iteration = simulation.iteration
+        status = simulation.step()
+        if checkpoint_path and status is None and simulation.iteration % checkpoint_every == 0:
+            save_checkpoint(simulation, checkpoint_path)
+        if status == "extinct":
+            print(f"Популяція вимерла на {iteration}-й ітерації.")
             break
-        gained_resources = organism.compete(total_available_resources)
-        total_available_resources -= gained_resources
-
-    predators = [o for o in population if isinstance(o, OrganismB) and o.is_stressed()]
-    for predator in predators:
-        victims = [o for o in population if isinstance(o, OrganismA)] 
-        if not victims:
-            break 
-        victim = random.choice([o for o in population if isinstance(o, OrganismA)])
-        result = predator.prey_on(victim)
-        if result == "killed":
-            population.remove(predator)
-        elif result:
-            population.remove(victim)
-
-    for organism in population:
-        organism.survive()
-    population = [o for o in population if not o.is_dead() and not o.is_expired()]
-
-    new_population = []
-    for organism in population:
-        organism.ready_for_reproduction()
-        if organism.can_reproduce():
-            new_population.append(organism.reproduce())
-    population.extend(new_population)
-
-    group_a = [o for o in population if isinstance(o, OrganismA)]
-    group_b = [o for o in population if isinstance(o, OrganismB)]
-    statistics["iteration"].append(iteration)
-    statistics["population_size_a"].append(len(group_a))
-    statistics["population_size_b"].append(len(group_b))
-    statistics["average_efficiency_a"].append(sum(o.efficiency for o in group_a) / len(group_a) if group_a else 0)
-    statistics["average_efficiency_b"].append(sum(o.efficiency for o in group_b) / len(group_b) if group_b else 0)
-
-    if not group_a or not group_b:
-        print(f"Популяція вимерла на {iteration}-й ітерації.")
-        break
-    if len(group_a)>10000 or len(group_b)>10000:
-        print(f"Популяція перемножилась на {iteration}-й ітерації.")
-        break
-
-plt.figure(figsize=(12, 6))
-plt.subplot(1, 2, 1)
-plt.plot(statistics["iteration"], statistics["population_size_a"], label="Population A")
-plt.plot(statistics["iteration"], statistics["population_size_b"], label="Population B")
-plt.xlabel("Iteration")
-plt.ylabel("Population Size")
-plt.title("Population Size Over Time")
-plt.legend()
-
-plt.subplot(1, 2, 2)
-plt.plot(statistics["iteration"], statistics["average_efficiency_a"], label="Efficiency A", color="blue")
-plt.plot(statistics["iteration"], statistics["average_efficiency_b"], label="Efficiency B", color="red")
-plt.xlabel("Iteration")
-plt.ylabel("Average Efficiency")
-plt.title("Average Efficiency Over Time")
-plt.legend()
-
-plt.tight_layout()
-plt.show()
+        if status == "explosion":
+            print(f"Популяція перемножилась на {iteration}-й ітерації.")
+            break
+
+    if checkpoint_path:
+        save_checkpoint(simulation, checkpoint_path)
+    simulation.close()
+    if instrument:
+        print(simulation.instrumentation.report())
+    if histograms:
+        histograms.save(histograms_path)
+    if simulation.genealogy is not None:
+        print(f"Лінії засновників, що дожили до кінця: {simulation.genealogy.founder_lineages()}.")
+        simulation.genealogy.save(genealogy_path)
+
+    statistics = read_statistics(statistics_path) if statistics_path else simulation.statistics
+    if show:
+        plot_statistics(statistics, histograms)
+    return statistics
+
+
+def plot_statistics(statistics, histograms=None):
+    import matplotlib.pyplot as plt
+
+    plt.figure(figsize=(12, 6))
+    plt.subplot(1, 2, 1)
+    plt.plot(statistics["iteration"], statistics["population_size_a"], label="Population A")
+    plt.plot(statistics["iteration"], statistics["population_size_b"], label="Population B")
+    plt.xlabel("Iteration")
+    plt.ylabel("Population Size")
+    plt.title("Population Size Over Time")
+    plt.legend()
+
+    plt.subplot(1, 2, 2)
+    plt.plot(statistics["iteration"], statistics["average_efficiency_a"], label="Efficiency A", color="blue")
+    plt.plot(statistics["iteration"], statistics["average_efficiency_b"], label="Efficiency B", color="red")
+    plt.xlabel("Iteration")
+    plt.ylabel("Average Efficiency")
+    plt.title("Average Efficiency Over Time")
+    plt.legend()
+    plt.tight_layout()
+
+    # Розподіл ефективності кожної групи (лінії — P10, P50, P90)
+    if histograms is not None:
+        figure, axes = plt.subplots(1, 2, figsize=(12, 5))
+        histograms.plot_heatmap("efficiency", 0, axes[0], label="A")
+        histograms.plot_heatmap("efficiency", 1, axes[1], label="B")
+        figure.tight_layout()
+
+    plt.show()
+
+
+if __name__ == "__main__":
+    run(load_settings(), show=True)
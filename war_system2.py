@@ -1,8 +1,16 @@
-import random
+import os
+import queue
+import threading
+import time
 import tkinter as tk
 from tkinter import messagebox
 import matplotlib.pyplot as plt
 from matplotlib.widgets import Button, TextBox
+from checkpoint import load_checkpoint, save_checkpoint
+from engine import WAR_MODEL, WarSimulation
+from live_plot import MinMaxDecimator
+from statistics_sink import read_statistics
+from war_system import SETTINGS_KEYS
 
 # Налаштування симуляції
 NUM_ORGANISMS_A = 100
@@ -20,116 +28,25 @@ STARTING_RESOURCES = 160
 PREDATION_GAIN = 40
 ESCAPE_CHANCE = 0.3 # Шанс втечі
 COUNTERATTACK_CHANCE_FACTOR = 0.1  # Коефіцієнт для розрахунку шансу контратаки
-
-# Клас для ресурсів
-class Resource:
-    def __init__(self, amount):
-        self.amount = amount
-        self.age = 0
-
-    def age_one_turn(self):
-        self.age += 1
-
-    def is_expired(self):
-        return self.age > RESOURCE_EXPIRATION
-
-# Базовий клас для організмів
-class Organism:
-    def __init__(self, efficiency, reproduction_cost):
-        self.efficiency = efficiency
-        self.resources = STARTING_RESOURCES
-        self.no_resources_turns = 0
-        self.reproduction_ready_turns = 0
-        self.time_since_last_reproduction = 0
-        self.reproduction_cost = reproduction_cost
-        self.age = 0
-
-    def age_one_turn(self):
-        self.age += 1
-
-    def is_expired(self):
-        return self.age > EXPIRED
-    def compete(self, available_resources):
-        needed = max(RESOURCE_COST, self.efficiency)
-        gained = self.efficiency*available_resources
-        self.resources += gained
-        return gained
-
-    def can_reproduce(self):
-        return self.reproduction_ready_turns >= 3
-
-    def ready_for_reproduction(self):
-        if self.resources >= self.reproduction_cost:
-            self.reproduction_ready_turns += 1
-        else:
-            self.reproduction_ready_turns = 0
-
-    def reproduce(self):
-        self.resources -= self.reproduction_cost
-        self.reproduction_ready_turns = 0
-        self.time_since_last_reproduction = 0
-        new_efficiency = max(0.1, self.efficiency + random.uniform(-MUTATION_RATE, MUTATION_RATE))
-        return self.__class__(new_efficiency, self.reproduction_cost)
-
-    def survive(self):
-        if self.resources >= RESOURCE_COST:
-            self.resources -= RESOURCE_COST
-            self.no_resources_turns = 0
-        else:
-            self.no_resources_turns += 1
-        self.time_since_last_reproduction += 1
-
-    def is_dead(self):
-        return self.no_resources_turns >= 2
-
-# Група A: стандартні організми
-class OrganismA(Organism):
-    def __init__(self, efficiency, reproduction_cost = RESOURCE_REPRODUCTION_COST_A):
-        super().__init__(efficiency, RESOURCE_REPRODUCTION_COST_A)
-    def can_reproduce(self):
-        return self.reproduction_ready_turns >= 3
-    def attempt_escape_or_counterattack(self, predator):
-        if random.random() < ESCAPE_CHANCE:  # Шанс втечі
-            predator.resources += self.resources
-            self.resources = 0
-            return "escaped"
-        else:
-            counterattack_chance = self.efficiency * COUNTERATTACK_CHANCE_FACTOR
-            if random.random() < counterattack_chance:
-                return "counterattack"
-            return "attacked"
-
-# Група B: хижаки
-class OrganismB(Organism):
-    def __init__(self, efficiency, reproduction_cost = RESOURCE_REPRODUCTION_COST_B):
-        super().__init__(efficiency * 0.5, RESOURCE_REPRODUCTION_COST_B)
-
-    def is_stressed(self):
-        return self.resources < RESOURCE_COST or self.time_since_last_reproduction > PREDATION_THRESHOLD
-    def can_reproduce(self):
-        return self.reproduction_ready_turns >= 7
-    def prey_on(self, victim):
-        if True: #isinstance(victim, OrganismA):
-            outcome = victim.attempt_escape_or_counterattack(self)
-            if outcome == "escaped":
-                return False  # Жертва втекла
-            elif outcome == "counterattack":
-                return "killed"  # Хижак помер через контратаку
-            else:
-                self.resources += victim.resources
-                victim.resources = 0
-                return True
-        return False
-
-# Ініціалізація популяції
-population = [OrganismA(random.uniform(0.1, 1.0)) for _ in range(NUM_ORGANISMS_A)] + \
-             [OrganismB(random.uniform(0.1, 1.0)) for _ in range(NUM_ORGANISMS_B)]
-resources = [Resource(RESOURCE_GENERATION) for _ in range(RESOURCE_GENERATION)]
-statistics = {"iteration": [], "population_size_a": [], "population_size_b": [], "average_efficiency_a": [], "average_efficiency_b": []}
-iteration = 0
-# Основний цикл симуляції
-# for iteration in range(NUM_ITERATIONS):
-    
+SUPER_INDIVIDUAL_THRESHOLD = None  # Поріг суперорганізмів (None — зупинка при 10000 організмів)
+COMPETITION_MODE = "sequential"  # Поділ ресурсів: "sequential", "proportional" або "legacy"
+GRID_SIZE = None  # Сторона ґратки (None — без простору); діє після "Рестарт"
+MAX_FPS = 20  # Максимальна частота перемальовування в режимі автозапуску
+CHECKPOINT_PATH = "war_checkpoint"  # Каталог контрольної точки (кнопки "Зберегти" і "Завантажити")
+
+# Поточні значення налаштувань (змінюються кнопкою "Оновлення")
+def current_settings():
+    return {key: globals()[key] for key in SETTINGS_KEYS}
+
+# Симуляція виконується спільним ядром engine.py
+simulation = WarSimulation(current_settings())
+
+# Стан автозапуску: симуляція рахується у фоновому потоці, а графіки малює головний
+simulation_lock = threading.Lock()
+updates = queue.Queue()
+worker = None
+stop_event = None
+last_redraw = 0.0
 
 # Function to show a popup on error
 def show_error_popup(error_message):
@@ -143,114 +60,176 @@ def show_info_popup(error_message):
     root.withdraw()  # Hide the root window
     messagebox.showinfo("Info", error_message)
 
+# Одна ітерація симуляції (без малювання); повертає рядок статистики та повідомлення
+def simulation_step():
+    status = simulation.step()
+    row = simulation.last_row
+    message = None
+    if status == "extinct":
+        message = f"Популяція вимерла на {row['iteration']}-й ітерації."
+    elif status == "explosion":
+        message = f"Популяція перемножилась на {row['iteration']}-й ітерації."
+    return row, message
+
+# Додає рядок статистики до графіків; викликається лише з головного потоку
+def record_statistics(row):
+    for key, decimator in decimated.items():
+        decimator.add(row["iteration"], row[key])
+
+# Перемальовування графіків за накопиченою статистикою
+# Лінії отримують лише проріджені ряди (не більше двох точок на піксель ширини осей),
+# тож вартість перемальовування не залежить від довжини симуляції
+def redraw():
+    for key, line in lines.items():
+        line.set_data(*decimated[key].view())
+    for ax in (ax1, ax2):
+        ax.relim()
+        ax.autoscale_view()
+    plt.draw()
+
 # Функція для оновлення популяції вручну
 def manual_update(event):
-    global population, resources, statistics,iteration
+    if worker is not None:
+        return  # Під час автозапуску кроки рахує фоновий потік
     try:
-        resources.extend(Resource(RESOURCE_GENERATION) for _ in range(RESOURCE_GENERATION))
-        for resource in resources:
-            resource.age_one_turn()
-        resources = [r for r in resources if not r.is_expired()]
-        total_available_resources = sum(r.amount for r in resources)
-
-        random.shuffle(population)
-        for organism in population:
-            organism.age_one_turn()
-            if total_available_resources <= 0:
-                break
-            gained_resources = organism.compete(total_available_resources)
-            total_available_resources -= gained_resources
-
-        predators = [o for o in population if isinstance(o, OrganismB) and o.is_stressed()]
-        for predator in predators:
-            victims = [o for o in population if isinstance(o, OrganismA)] 
-            if not victims:
-                break 
-            victim = random.choice([o for o in population if isinstance(o, OrganismA)])
-            result = predator.prey_on(victim)
-            if result == "killed":
-                population.remove(predator)
-            elif result:
-                population.remove(victim)
-
-        for organism in population:
-            organism.survive()
-        population = [o for o in population if not o.is_dead() and not o.is_expired()]
-
-        new_population = []
-        for organism in population:
-            organism.ready_for_reproduction()
-            if organism.can_reproduce():
-                new_population.append(organism.reproduce())
-        population.extend(new_population)
-
-        group_a = [o for o in population if isinstance(o, OrganismA)]
-        group_b = [o for o in population if isinstance(o, OrganismB)]
-        statistics["iteration"].append(iteration)
-        statistics["population_size_a"].append(len(group_a))
-        statistics["population_size_b"].append(len(group_b))
-        statistics["average_efficiency_a"].append(sum(o.efficiency for o in group_a) / len(group_a) if group_a else 0)
-        statistics["average_efficiency_b"].append(sum(o.efficiency for o in group_b) / len(group_b) if group_b else 0)
-
-        if not group_a or not group_b:
-            print(f"Популяція вимерла на {iteration}-й ітерації.")
-            show_error_popup(f"Популяція вимерла на {iteration}-й ітерації.")
-
-        if len(group_a)>10000 or len(group_b)>10000:
-            print(f"Популяція перемножилась на {iteration}-й ітерації.")
-            show_error_popup(f"Популяція перемножилась на {iteration}-й ітерації.")
-        # Оновлення графіка
-        ax1.clear()
-        ax1.plot(statistics["iteration"], statistics["population_size_a"], label="Population A")
-        ax1.plot(statistics["iteration"], statistics["population_size_b"], label="Population B")
-        ax1.set_title("Population Size Over Time")
-        ax1.set_xlabel("Iteration")
-        ax1.set_ylabel("Population Size")
-        ax1.legend()
-        ax1.grid()
-        
-        # Оновлення графіка
-        ax2.clear()
-        ax2.plot(statistics["iteration"], statistics["average_efficiency_a"], label="Efficiency A", color="blue")
-        ax2.plot(statistics["iteration"], statistics["average_efficiency_b"], label="Efficiency B", color="red")
-
-        ax2.set_title("Average Efficiency Over Time")
-        ax2.set_xlabel("Iteration")
-        ax2.set_ylabel("Average Efficiency")
-        ax2.legend()
-        ax2.grid()
-        plt.draw()
-        iteration+=1
+        with simulation_lock:
+            row, message = simulation_step()
+        record_statistics(row)
+        if message:
+            print(message)
+            show_error_popup(message)
+        redraw()
     except ValueError as e:
         print(f"Помилка: {e}")
 
+# Фоновий потік автозапуску: рахує ітерації на повній швидкості й передає статистику через чергу
+def auto_run_worker(stop_event, num_iterations):
+    for _ in range(num_iterations):
+        if stop_event.is_set():
+            break
+        with simulation_lock:
+            row, message = simulation_step()
+        updates.put((row, message))
+        if message:
+            break
+    updates.put(None)  # Сигнал завершення
+
+def start_auto_run():
+    global worker, stop_event, NUM_ITERATIONS
+    # Кількість ітерацій береться з поля одразу, без кнопки "Оновлення"
+    try:
+        num_iterations = int(textbox_NUM_ITERATIONS.text)
+    except ValueError:
+        show_error_popup(f"Кількість ітерацій має бути цілим числом, отримано \"{textbox_NUM_ITERATIONS.text}\".")
+        return
+    if num_iterations < 1:
+        show_error_popup(f"Кількість ітерацій має бути додатною, отримано {num_iterations}.")
+        return
+    NUM_ITERATIONS = num_iterations
+    stop_event = threading.Event()
+    worker = threading.Thread(target=auto_run_worker, args=(stop_event, NUM_ITERATIONS), daemon=True)
+    worker.start()
+    button_auto.label.set_text("Пауза")
+
+def stop_auto_run():
+    global worker
+    if worker is not None:
+        stop_event.set()
+        worker.join()
+        worker = None
+        poll_updates()
+    button_auto.label.set_text("Авто")
+
+def toggle_auto_run(event):
+    if worker is None:
+        start_auto_run()
+    else:
+        stop_auto_run()
+
+# Таймер головного потоку: забирає статистику з черги й перемальовує не частіше за MAX_FPS
+def poll_updates():
+    global worker, last_redraw
+    received = False
+    finished = False
+    while True:
+        try:
+            update = updates.get_nowait()
+        except queue.Empty:
+            break
+        if update is None:
+            finished = True
+            continue
+        row, message = update
+        record_statistics(row)
+        received = True
+        if message:
+            print(message)
+            show_error_popup(message)
+    if finished and worker is not None:
+        worker = None
+        button_auto.label.set_text("Авто")
+    if received and time.monotonic() - last_redraw >= 1 / MAX_FPS:
+        redraw()
+        last_redraw = time.monotonic()
+    elif finished:
+        redraw()
+
+# Переносить налаштування відновленої симуляції у глобальні змінні та текстові поля
+def sync_settings():
+    for key in SETTINGS_KEYS:
+        globals()[key] = simulation.settings[key]
+        textbox = globals().get(f"textbox_{key}")
+        if textbox is not None:
+            textbox.set_val(str(simulation.settings[key]))
+
+def save_evolution(event):
+    stop_auto_run()
+    path = textbox_CHECKPOINT_PATH.text.strip()
+    try:
+        with simulation_lock:
+            save_checkpoint(simulation, path)
+    except OSError as e:
+        show_error_popup(f"Не вдалося зберегти: {e}")
+        return
+    show_info_popup(f"Збережено {simulation.iteration}-ту ітерацію")
+
+# Рестарт: нова симуляція з поточними налаштуваннями
 def restart_evolution(event):
-    global population, resources, statistics,iteration  
-      
-    # # Налаштування симуляції
-    # NUM_ORGANISMS_A = 100
-    # NUM_ORGANISMS_B = 90
-    # NUM_ITERATIONS = 1
-    # RESOURCE_GENERATION = 20
-    # RESOURCE_COST = 10
-    # RESOURCE_REPRODUCTION_COST_A = 21
-    # RESOURCE_REPRODUCTION_COST_B = 60
-    # RESOURCE_EXPIRATION = 3
-    # EXPIRED = 8
-    # MUTATION_RATE = 0.1
-    # PREDATION_THRESHOLD = 4
-    # STARTING_RESOURCES = 160
-    # PREDATION_GAIN = 40
-    # ESCAPE_CHANCE = 0.3 # Шанс втечі
-    # COUNTERATTACK_CHANCE_FACTOR = 0.1  # Коефіцієнт для розрахунку шансу контратаки
-
-    population = [OrganismA(random.uniform(0.1, 1.0)) for _ in range(NUM_ORGANISMS_A)] + \
-             [OrganismB(random.uniform(0.1, 1.0)) for _ in range(NUM_ORGANISMS_B)]
-    resources = [Resource(RESOURCE_GENERATION) for _ in range(RESOURCE_GENERATION)]
-    statistics = {"iteration": [], "population_size_a": [], "population_size_b": [], "average_efficiency_a": [], "average_efficiency_b": []}
-    iteration = 0
+    global simulation
+    stop_auto_run()
+    for decimator in decimated.values():
+        decimator.reset()
+    simulation = WarSimulation(current_settings())
+    redraw()
     show_info_popup("Успішно розпочато")
 
+# Завантаження контрольної точки war-симуляції (зокрема з потоковою статистикою war_system.run)
+def load_evolution(event):
+    global simulation
+    stop_auto_run()
+    path = textbox_CHECKPOINT_PATH.text.strip()
+    if not path or not os.path.exists(path):
+        show_error_popup(f"Контрольної точки {path!r} не існує")
+        return
+    try:
+        loaded = load_checkpoint(path)
+        if loaded.model is not WAR_MODEL:
+            raise ValueError(f"контрольна точка моделі {loaded.model.name!r}, а не war")
+        # Потокова статистика (StreamingSink) зберігається у файлі, а не в statistics
+        statistics = loaded.statistics if loaded.statistics is not None else read_statistics(loaded.sink.path)
+    except (OSError, ValueError, KeyError) as e:
+        show_error_popup(f"Не вдалося завантажити: {e}")
+        return
+    simulation = loaded
+    for decimator in decimated.values():
+        decimator.reset()
+    for i, iteration in enumerate(statistics["iteration"]):
+        for key, decimator in decimated.items():
+            decimator.add(iteration, statistics[key][i])
+    sync_settings()
+    redraw()
+    show_info_popup(f"Продовжено з {simulation.iteration}-ї ітерації")
+
 def value_update(event):
     global NUM_ORGANISMS_A
     global NUM_ORGANISMS_B
@@ -282,6 +261,9 @@ def value_update(event):
     MUTATION_RATE = float(textbox_MUTATION_RATE.text)
     ESCAPE_CHANCE = float(textbox_ESCAPE_CHANCE.text)
     COUNTERATTACK_CHANCE_FACTOR = float(textbox_COUNTERATTACK_CHANCE_FACTOR.text)
+    with simulation_lock:
+        simulation.settings.update(current_settings())
+        simulation.resources.set_expiration(RESOURCE_EXPIRATION)
 
     show_info_popup("Успішно оновлено")
 
@@ -290,20 +272,31 @@ plt.figure(figsize=(12, 8))
 plt.subplots_adjust(bottom=0.4)  # Reserve space at the bottom for widgets
 
 ax1 = plt.subplot(1, 2, 1)
-plt.plot(statistics["iteration"], statistics["population_size_a"], label="Population A")
-plt.plot(statistics["iteration"], statistics["population_size_b"], label="Population B")
+line_population_a, = plt.plot([], [], label="Population A")
+line_population_b, = plt.plot([], [], label="Population B")
 plt.xlabel("Iteration")
 plt.ylabel("Population Size")
 plt.title("Population Size Over Time")
 plt.legend()
+plt.grid()
 
 ax2 = plt.subplot(1, 2, 2)
-plt.plot(statistics["iteration"], statistics["average_efficiency_a"], label="Efficiency A", color="blue")
-plt.plot(statistics["iteration"], statistics["average_efficiency_b"], label="Efficiency B", color="red")
+line_efficiency_a, = plt.plot([], [], label="Efficiency A", color="blue")
+line_efficiency_b, = plt.plot([], [], label="Efficiency B", color="red")
 plt.xlabel("Iteration")
 plt.ylabel("Average Efficiency")
 plt.title("Average Efficiency Over Time")
 plt.legend()
+plt.grid()
+
+# Постійні лінії та їхні проріджені ряди (кількість кошиків = ширина осей у пікселях)
+lines = {
+    "population_size_a": line_population_a,
+    "population_size_b": line_population_b,
+    "average_efficiency_a": line_efficiency_a,
+    "average_efficiency_b": line_efficiency_b,
+}
+decimated = {key: MinMaxDecimator(line.axes.bbox.width) for key, line in lines.items()}
 # Adjust space for buttons/textboxes
 
 # Налаштування симуляції
@@ -377,5 +370,25 @@ ax_button_manual_r = plt.axes([0.85, 0.05, 0.1, 0.05])  # [x, y, width, height]
 button_manual_r = Button(ax_button_manual_r, "Рестарт")
 button_manual_r.on_clicked(restart_evolution)
 
+ax_button_auto = plt.axes([0.85, 0.11, 0.1, 0.05])  # [x, y, width, height] in figure coordinates
+button_auto = Button(ax_button_auto, "Авто")
+button_auto.on_clicked(toggle_auto_run)
+
+ax_button_save = plt.axes([0.85, 0.17, 0.1, 0.05])  # [x, y, width, height] in figure coordinates
+button_save = Button(ax_button_save, "Зберегти")
+button_save.on_clicked(save_evolution)
+
+ax_textbox_CHECKPOINT_PATH = plt.axes([0.85, 0.23, 0.1, 0.05])  # [x, y, width, height] in figure coordinates
+textbox_CHECKPOINT_PATH = TextBox(ax_textbox_CHECKPOINT_PATH, "Файл:", initial=CHECKPOINT_PATH)
+
+ax_button_load = plt.axes([0.85, 0.29, 0.1, 0.05])  # [x, y, width, height] in figure coordinates
+button_load = Button(ax_button_load, "Завантажити")
+button_load.on_clicked(load_evolution)
+
+# Таймер, що опитує чергу статистики фонового потоку
+timer = plt.gcf().canvas.new_timer(interval=1000 // MAX_FPS)
+timer.add_callback(poll_updates)
+timer.start()
+
 # plt.tight_layout()
 plt.show()